@@ -21,4 +21,33 @@ def bfs(start: TNode, get_nodes: GetAdjacentNodesFuncTypeDef) -> set[TNode]:
                 queue.append(neighbor)
                 result.add(neighbor)
 
-    return result
\ No newline at end of file
+    return result
+
+
+def get_distances_to(
+    target: TNode, get_predecessors: GetAdjacentNodesFuncTypeDef
+) -> dict[TNode, int]:
+    """
+    Finds the distance from every node that can reach `target` to it, with a single
+    breadth first search walking the edges backwards from the target.
+
+    :param target: the node all distances are measured to
+    :param get_predecessors: a function that takes a node as input and returns the
+        nodes with an edge into it
+    :returns: the number of steps to `target` of each node that can reach it
+    """
+    distances = {target: 0}
+    frontier = [target]
+    distance = 0
+
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for node in frontier:
+            for predecessor in get_predecessors(node):
+                if predecessor not in distances:
+                    distances[predecessor] = distance
+                    next_frontier.append(predecessor)
+        frontier = next_frontier
+
+    return distances
@@ -0,0 +1,50 @@
+from math import gcd
+from typing import Iterable
+from typing import TypeAlias
+
+# x ≡ residue (mod modulus), as (residue, modulus) with 0 <= residue < modulus
+Congruence: TypeAlias = tuple[int, int]
+
+
+def combine_congruences(a: Congruence, b: Congruence) -> Congruence | None:
+    """
+    Combines two congruences into the single one satisfied by the same integers, by
+    the Chinese remainder theorem. The moduli do not need to be coprime.
+
+    :returns: the combined congruence, modulo the lcm of both moduli, or None if no
+        integer satisfies both
+    """
+    residue_a, modulus_a = a
+    residue_b, modulus_b = b
+
+    divisor = gcd(modulus_a, modulus_b)
+    delta = residue_b - residue_a
+    if delta % divisor:
+        return None
+
+    step = modulus_b // divisor
+    # Multiple of `modulus_a` to add to `residue_a` so it is also `residue_b`
+    k = (delta // divisor) * pow(modulus_a // divisor, -1, step) % step
+    modulus = modulus_a * step
+
+    return (residue_a + k * modulus_a) % modulus, modulus
+
+
+def solve_congruences(congruences: Iterable[Congruence]) -> Congruence | None:
+    """
+    Finds the integers satisfying all the congruences at once.
+
+    :returns: the solutions as a single congruence, `(0, 1)` when there are no
+        congruences, or None if there are no solutions
+    """
+    result: Congruence = (0, 1)
+
+    for residue, modulus in congruences:
+        if modulus <= 0:
+            raise ValueError(f"Invalid modulus: {modulus}")
+        combined = combine_congruences(result, (residue % modulus, modulus))
+        if combined is None:
+            return None
+        result = combined
+
+    return result
@@ -1,8 +1,13 @@
 import functools
+import pickle
+import sys
 import time
 from functools import wraps
+from types import ModuleType
+from typing import Any
 from typing import Callable
 from typing import ParamSpec
+from typing import Self
 from typing import TypeAlias
 from typing import TypeVar
 from typing import Union
@@ -11,6 +16,7 @@ from attr import define
 from attr import field
 
 from advent_of_code.exceptions import IncorrectReturnTypeError
+from advent_of_code.exceptions import StateChangedError
 from advent_of_code.type_defs import Solution as Solution2
 
 AnswerType: TypeAlias = int | float | str | None
@@ -109,6 +115,7 @@ DecoratedPartialSolutionFuncTypeDef: TypeAlias = Callable[
 class AdventOfCode:
     def __init__(self) -> None:
         self._solutions: dict[tuple[int, int], DecoratedSolutionFuncTypeDef] = {}
+        self._caches: list[Any] = []
 
     def solution(
         self, year: int, day: int
@@ -177,5 +184,114 @@ class AdventOfCode:
     def count_solutions(self) -> int:
         return len(self._solutions)
 
+    def register_cache(self, func: T) -> T:
+        """
+        Registers a `functools.cache` (or `lru_cache`) function, so it is cleared
+        by `clear_caches` in between benchmarked runs.
+        """
+        if not callable(getattr(func, "cache_clear", None)):
+            raise TypeError(f"{func!r} is not a functools cache")
+        self._caches.append(func)
+        return func
+
+    def clear_caches(self, module: ModuleType | None = None) -> None:
+        """
+        Clears the registered caches, and the caches found in the globals of
+        `module` if given.
+        """
+        caches = list(self._caches)
+        if module is not None:
+            caches.extend(
+                value
+                for value in vars(module).values()
+                if callable(getattr(value, "cache_clear", None))
+            )
+        for cache in caches:
+            cache.cache_clear()
+
 
 aoc = AdventOfCode()
+
+
+def _get_state(value: object) -> object:
+    """
+    Returns a snapshot of a value, to compare it after a call.
+
+    The pickled bytes also catch changes nested inside of containers. Values that
+    cannot be pickled are only compared by identity.
+    """
+    try:
+        return pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return id(value)
+
+
+class StateGuard:
+    """
+    Checks that the globals of a module are unchanged after a block of code.
+
+    Names that are added, removed or rebound, and values that are changed in place
+    are reported. Modules, functions and classes are skipped, as those are not
+    state a solution keeps. Used as `with StateGuard(module): solve(s)`.
+    """
+
+    def __init__(self, module: ModuleType) -> None:
+        self._module = module
+        self._before: dict[str, object] = {}
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            name: _get_state(value)
+            for name, value in vars(self._module).items()
+            if not name.startswith("__")
+            and not isinstance(value, (ModuleType, type))
+            and not callable(value)
+        }
+
+    def changed(self) -> list[str]:
+        """Returns the names of the globals that changed since entering the guard"""
+        after = self.snapshot()
+        return sorted(
+            name
+            for name in self._before.keys() | after.keys()
+            if self._before.get(name) != after.get(name)
+        )
+
+    def __enter__(self) -> Self:
+        self._before = self.snapshot()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        if exc_type is not None:
+            return
+        if changed := self.changed():
+            raise StateChangedError(
+                f"Module '{self._module.__name__}' globals changed: "
+                f"{', '.join(changed)}"
+            )
+
+
+def run_isolated(
+    func: DecoratedSolutionFuncTypeDef,
+    s: str,
+    repeat: int = 1,
+    app: AdventOfCode = aoc,
+) -> list[Solution]:
+    """
+    Runs a solution `repeat` times in the current interpreter, as if each run was
+    the first one.
+
+    Caches are cleared before every run, and a run fails with `StateChangedError`
+    if it changes the globals of the module of the solution.
+
+    :param app: the instance the solution and its caches are registered with
+    """
+    module = sys.modules[func.__module__]
+    results = []
+
+    for _ in range(repeat):
+        app.clear_caches(module)
+        with StateGuard(module):
+            results.append(func(s))
+
+    return results
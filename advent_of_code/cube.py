@@ -0,0 +1,255 @@
+from array import array
+from collections import deque
+from math import isqrt
+from typing import Mapping
+from typing import NamedTuple
+from typing import Sequence
+from typing import TypeAlias
+
+Vector3: TypeAlias = tuple[int, int, int]
+CellState: TypeAlias = tuple[int, int, int]  # (row, col, direction)
+WrapTable: TypeAlias = dict[CellState, CellState]
+
+# Directions are numbered like the facing values of AoC 2022 day 22
+RIGHT, DOWN, LEFT, UP = 0, 1, 2, 3
+DIRECTION_OFFSETS: tuple[tuple[int, int], ...] = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+OPEN = "."
+WALL = "#"
+VOID = " "
+
+
+def _neg(v: Vector3) -> Vector3:
+    return -v[0], -v[1], -v[2]
+
+
+def _dot(a: Vector3, b: Vector3) -> int:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _combine(*terms: tuple[int, Vector3]) -> Vector3:
+    x = y = z = 0
+    for k, (vx, vy, vz) in terms:
+        x += k * vx
+        y += k * vy
+        z += k * vz
+    return x, y, z
+
+
+def pack_state(row: int, col: int, direction: int, width: int) -> int:
+    return (row * width + col) * 4 + direction
+
+
+def unpack_state(state: int, width: int) -> CellState:
+    cell, direction = divmod(state, 4)
+    row, col = divmod(cell, width)
+    return row, col, direction
+
+
+class CubeFace(NamedTuple):
+    """A face of the net placed on the folded cube.
+
+    `tile` is the (row, col) of the face in units of faces; `normal` points out of
+    the cube and `right`/`down` are the 3D directions of increasing `col`/`row`.
+    """
+
+    tile: tuple[int, int]
+    normal: Vector3
+    right: Vector3
+    down: Vector3
+
+    def get_direction_vector(self, direction: int) -> Vector3:
+        return (self.right, self.down, _neg(self.right), _neg(self.down))[direction]
+
+
+class CubeNet:
+    """Folds a flat cube net into a cube and derives how its open edges are glued.
+
+    Works for any of the 11 cube nets and any face size. The face size is inferred
+    from the number of non-void cells. Faces are folded with a BFS over the net:
+    crossing into a neighbor tile rotates the frame 90 degrees around the shared
+    edge. Once every face knows its frame, each edge cell is mapped in 3D to find
+    the cell and facing on the other side.
+    """
+
+    def __init__(self, lines: Sequence[str]) -> None:
+        self._lines = list(lines)
+        self._height = len(self._lines)
+        self._width = max(len(line) for line in self._lines)
+
+        total = sum(1 for line in self._lines for c in line if c != VOID)
+        size = isqrt(total // 6)
+        if total == 0 or 6 * size * size != total:
+            raise ValueError(f"{total} cells cannot be folded into a cube")
+        self._size = size
+
+        tiles = {
+            (row // size, col // size)
+            for row in range(0, self._height, size)
+            for col in range(0, self._width, size)
+            if self.get_tile(row, col) != VOID
+        }
+        if len(tiles) != 6:
+            raise ValueError(f"Expected 6 faces of size {size}, found {len(tiles)}")
+
+        self._faces = self._fold(tiles)
+        self._by_normal = {face.normal: face for face in self._faces.values()}
+        if len(self._by_normal) != 6:
+            raise ValueError("The net does not fold into a cube")
+
+    @staticmethod
+    def _fold(tiles: set[tuple[int, int]]) -> dict[tuple[int, int], CubeFace]:
+        first = min(tiles)
+        faces = {
+            first: CubeFace(first, normal=(0, 0, -1), right=(1, 0, 0), down=(0, 1, 0))
+        }
+        queue = deque([first])
+
+        while queue:
+            face = faces[queue.popleft()]
+            t_row, t_col = face.tile
+            n, r, d = face.normal, face.right, face.down
+            for tile, normal, right, down in (
+                ((t_row, t_col + 1), r, _neg(n), d),
+                ((t_row, t_col - 1), _neg(r), n, d),
+                ((t_row + 1, t_col), d, r, _neg(n)),
+                ((t_row - 1, t_col), _neg(d), r, n),
+            ):
+                if tile in tiles and tile not in faces:
+                    faces[tile] = CubeFace(tile, normal=normal, right=right, down=down)
+                    queue.append(tile)
+
+        return faces
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def faces(self) -> list[CubeFace]:
+        return list(self._faces.values())
+
+    def get_tile(self, row: int, col: int) -> str:
+        if 0 <= row < self._height and 0 <= col < len(self._lines[row]):
+            return self._lines[row][col]
+        return VOID
+
+    def get_wrap(self, row: int, col: int, direction: int) -> CellState:
+        """Returns the cell and facing after stepping off the face at (row, col)"""
+        size = self._size
+        face = self._faces[row // size, col // size]
+        i, j = row % size, col % size
+
+        # Cell centers in doubled coordinates of a cube centered at the origin
+        point = _combine(
+            (size, face.normal),
+            (2 * j + 1 - size, face.right),
+            (2 * i + 1 - size, face.down),
+        )
+        heading = face.get_direction_vector(direction)
+        point = _combine((1, point), (1, heading), (-1, face.normal))
+
+        target = self._by_normal[heading]
+        new_i = (_dot(point, target.down) + size - 1) // 2
+        new_j = (_dot(point, target.right) + size - 1) // 2
+        new_heading = _neg(face.normal)
+        new_direction = next(
+            d for d in range(4) if target.get_direction_vector(d) == new_heading
+        )
+
+        return (
+            target.tile[0] * size + new_i,
+            target.tile[1] * size + new_j,
+            new_direction,
+        )
+
+    def get_wrap_table(self) -> WrapTable:
+        """Returns the wrap of every edge cell that steps off the net"""
+        size = self._size
+        result: WrapTable = {}
+
+        for face in self._faces.values():
+            top, left = face.tile[0] * size, face.tile[1] * size
+            edges = (
+                (RIGHT, [(top + k, left + size - 1) for k in range(size)]),
+                (DOWN, [(top + size - 1, left + k) for k in range(size)]),
+                (LEFT, [(top + k, left) for k in range(size)]),
+                (UP, [(top, left + k) for k in range(size)]),
+            )
+            for direction, cells in edges:
+                d_row, d_col = DIRECTION_OFFSETS[direction]
+                for row, col in cells:
+                    if self.get_tile(row + d_row, col + d_col) != VOID:
+                        continue
+                    result[row, col, direction] = self.get_wrap(row, col, direction)
+
+        return result
+
+
+def get_flat_wrap_table(lines: Sequence[str]) -> WrapTable:
+    """Returns the wrap of every edge cell when rows and columns wrap around"""
+    height = len(lines)
+    width = max(len(line) for line in lines)
+
+    def get_tile(row: int, col: int) -> str:
+        return lines[row][col] if col < len(lines[row]) else VOID
+
+    result: WrapTable = {}
+
+    for row in range(height):
+        cols = [col for col in range(width) if get_tile(row, col) != VOID]
+        if cols:
+            first, last = cols[0], cols[-1]
+            result[row, last, RIGHT] = (row, first, RIGHT)
+            result[row, first, LEFT] = (row, last, LEFT)
+
+    for col in range(width):
+        rows = [row for row in range(height) if get_tile(row, col) != VOID]
+        if rows:
+            first, last = rows[0], rows[-1]
+            result[last, col, DOWN] = (first, col, DOWN)
+            result[first, col, UP] = (last, col, UP)
+
+    return result
+
+
+def compile_moves(lines: Sequence[str], wraps: Mapping[CellState, CellState]) -> array:
+    """Compiles a board into a table of single forward steps.
+
+    States are packed with `pack_state`; `table[state]` is the state after moving
+    one cell forward, or `state` itself when the move is blocked by a wall. Cells
+    on the void have no valid moves and are left as -1.
+    """
+    height = len(lines)
+    width = max(len(line) for line in lines)
+
+    def get_tile(row: int, col: int) -> str:
+        if 0 <= row < height and 0 <= col < len(lines[row]):
+            return lines[row][col]
+        return VOID
+
+    table = array("q", [-1]) * (height * width * 4)
+
+    for row in range(height):
+        for col in range(len(lines[row])):
+            if get_tile(row, col) == VOID:
+                continue
+            for direction, (d_row, d_col) in enumerate(DIRECTION_OFFSETS):
+                state = pack_state(row, col, direction, width)
+                target = (row + d_row, col + d_col, direction)
+                if get_tile(target[0], target[1]) == VOID:
+                    target = wraps[row, col, direction]
+                if get_tile(target[0], target[1]) == WALL:
+                    table[state] = state
+                else:
+                    table[state] = pack_state(*target, width=width)
+
+    return table
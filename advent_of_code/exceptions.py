@@ -11,3 +11,7 @@ class UnexpectedConditionError(Exception):
 
 class IncorrectReturnTypeError(TypeError):
     pass
+
+
+class StateChangedError(Exception):
+    """Raise this error when a solution changes the module level state it depends on"""
@@ -1,5 +1,6 @@
 from enum import auto
 from enum import Enum
+from typing import Iterable
 from typing import Iterator
 from typing import NamedTuple
 from typing import Union
@@ -95,6 +96,164 @@ class Coord3D(NamedTuple):
         return Coord3D(x=self.x * other, y=self.y * other, z=self.z * other)
 
 
+class Grid3D:
+    """
+    Dense voxel grid over a 3D bounding box, stored as a flat `bytearray` indexed by
+    `(z * size_y + y) * size_x + x` in local coordinates.
+
+    The box is padded on every side: the outermost layer is a `BORDER` that is never
+    filled, and the layer below it is empty, so the outside of a shape is always
+    connected and neighbors of any non-border cell are one stride away.
+    """
+
+    EMPTY = 0
+    FILLED = 1
+    EXTERIOR = 2
+    BORDER = 3
+
+    _PADDING = 2
+
+    def __init__(
+        self,
+        size_x: int,
+        size_y: int,
+        size_z: int,
+        origin: tuple[int, int, int] = (0, 0, 0),
+    ) -> None:
+        padding = self._PADDING
+        o_x, o_y, o_z = origin
+        self._origin = (o_x - padding, o_y - padding, o_z - padding)
+        self._size_x = size_x + 2 * padding
+        self._size_y = size_y + 2 * padding
+        self._size_z = size_z + 2 * padding
+        self._strides = (1, self._size_x, self._size_x * self._size_y)
+        self._cells = bytearray(self._size_x * self._size_y * self._size_z)
+
+        # Border faces are set with slices, one z layer at a time
+        layer = self._size_x * self._size_y
+        border_row = bytes([self.BORDER]) * self._size_x
+        border_col = bytes([self.BORDER]) * self._size_y
+        for z in range(self._size_z):
+            start = z * layer
+            if z in (0, self._size_z - 1):
+                self._cells[start : start + layer] = bytes([self.BORDER]) * layer
+                continue
+            self._cells[start : start + self._size_x] = border_row
+            self._cells[start + layer - self._size_x : start + layer] = border_row
+            self._cells[start : start + layer : self._size_x] = border_col
+            self._cells[start + self._size_x - 1 : start + layer : self._size_x] = (
+                border_col
+            )
+
+    @staticmethod
+    def from_points(points: Iterable[tuple[int, int, int]]) -> "Grid3D":
+        points = list(points)
+        if not points:
+            raise ValueError("Cannot create a grid from no points")
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        zs = [p[2] for p in points]
+        grid = Grid3D(
+            size_x=max(xs) - min(xs) + 1,
+            size_y=max(ys) - min(ys) + 1,
+            size_z=max(zs) - min(zs) + 1,
+            origin=(min(xs), min(ys), min(zs)),
+        )
+        # Same as `grid.add` for each point, without re-checking the bounds
+        o_x, o_y, o_z = grid._origin
+        size_x, size_y = grid._size_x, grid._size_y
+        cells = grid._cells
+        for x, y, z in points:
+            cells[((z - o_z) * size_y + y - o_y) * size_x + x - o_x] = Grid3D.FILLED
+        return grid
+
+    def _local_index(self, x: int, y: int, z: int) -> int:
+        return (z * self._size_y + y) * self._size_x + x
+
+    def index(self, x: int, y: int, z: int) -> int:
+        """Returns the flat index of a point inside the (unpadded) bounding box"""
+        o_x, o_y, o_z = self._origin
+        l_x, l_y, l_z = x - o_x, y - o_y, z - o_z
+        padding = self._PADDING
+        if not (
+            padding <= l_x < self._size_x - padding
+            and padding <= l_y < self._size_y - padding
+            and padding <= l_z < self._size_z - padding
+        ):
+            raise IndexError(f"({x}, {y}, {z}) is outside of the grid")
+        return self._local_index(l_x, l_y, l_z)
+
+    def add(self, x: int, y: int, z: int) -> None:
+        self._cells[self.index(x, y, z)] = self.FILLED
+
+    def __contains__(self, point: object) -> bool:
+        if not isinstance(point, tuple) or len(point) != 3:
+            return False
+        try:
+            return self._cells[self.index(*point)] == self.FILLED
+        except IndexError:
+            return False
+
+    def __len__(self) -> int:
+        return self._cells.count(self.FILLED)
+
+    def get_mask(self, value: int) -> int:
+        """Returns a bitmask where bit `i` is set if cell `i` holds `value`"""
+        table = bytes(ord("1") if i == value else ord("0") for i in range(256))
+        return int(self._cells.translate(table)[::-1], 2)
+
+    def count_faces(self) -> int:
+        """Counts the faces of filled cells that do not touch another filled cell.
+
+        Two cells are adjacent along an axis when their indices differ by that
+        axis' stride, so touching pairs are the bits set in `mask & (mask >> stride)`.
+        """
+        mask = self.get_mask(self.FILLED)
+        touching = sum(
+            (mask & (mask >> stride)).bit_count() for stride in self._strides
+        )
+        return 6 * mask.bit_count() - 2 * touching
+
+    def flood_fill_exterior(self) -> int:
+        """Marks every empty cell connected to the outside of the grid as `EXTERIOR`,
+        returning the number of cells marked
+        """
+        cells = self._cells
+        empty, exterior = self.EMPTY, self.EXTERIOR
+        offsets = [d for stride in self._strides for d in (stride, -stride)]
+
+        start = self._local_index(1, 1, 1)
+        if cells[start] != empty:
+            return 0
+
+        cells[start] = exterior
+        stack = [start]
+        total = 1
+
+        while stack:
+            index = stack.pop()
+            for offset in offsets:
+                adjacent = index + offset
+                if cells[adjacent] == empty:
+                    cells[adjacent] = exterior
+                    stack.append(adjacent)
+                    total += 1
+
+        return total
+
+    def count_exterior_faces(self) -> int:
+        """Counts the faces of filled cells that touch the exterior. Call
+        `flood_fill_exterior` before, otherwise there is no exterior to touch.
+        """
+        filled = self.get_mask(self.FILLED)
+        exterior = self.get_mask(self.EXTERIOR)
+        return sum(
+            (filled & (exterior >> stride)).bit_count()
+            + (exterior & (filled >> stride)).bit_count()
+            for stride in self._strides
+        )
+
+
 class CardinalPoints(Enum):
     NORTH = auto()
     SOUTH = auto()
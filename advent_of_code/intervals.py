@@ -0,0 +1,282 @@
+from bisect import bisect_left
+from bisect import bisect_right
+from heapq import merge
+from typing import Iterable
+from typing import Iterator
+from typing import TypeAlias
+
+# Inclusive range of integers: (start, end)
+Interval: TypeAlias = tuple[int, int]
+
+
+def contains(outer: Interval, inner: Interval) -> bool:
+    """Checks if `inner` is fully inside of `outer`"""
+    return outer[0] <= inner[0] and inner[1] <= outer[1]
+
+
+def overlaps(a: Interval, b: Interval) -> bool:
+    """Checks if two intervals share at least one point"""
+    return a[0] <= b[1] and b[0] <= a[1]
+
+
+def _coalesce(intervals: Iterable[Interval]) -> tuple[list[int], list[int]]:
+    """Merges intervals sorted by start into disjoint, non adjacent intervals"""
+    starts: list[int] = []
+    ends: list[int] = []
+
+    for start, end in intervals:
+        if start > end:
+            raise ValueError(f"Invalid interval: {(start, end)}")
+        if ends and start <= ends[-1] + 1:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+
+    return starts, ends
+
+
+class IntervalSet:
+    """A set of integers stored as sorted, disjoint intervals.
+
+    Intervals that overlap or touch are merged when building the set.
+    """
+
+    __slots__ = ("_ends", "_starts")
+
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        self._starts, self._ends = _coalesce(sorted(intervals))
+
+    @classmethod
+    def _from_sorted(cls, intervals: Iterable[Interval]) -> "IntervalSet":
+        result = cls.__new__(cls)
+        result._starts, result._ends = _coalesce(intervals)
+        return result
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self._starts, self._ends, strict=True)
+
+    def __len__(self) -> int:
+        """Number of disjoint intervals"""
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def __contains__(self, point: int) -> bool:
+        idx = bisect_right(self._starts, point) - 1
+        return idx >= 0 and point <= self._ends[idx]
+
+    @property
+    def size(self) -> int:
+        """Number of integers in the set"""
+        return sum(self._ends) - sum(self._starts) + len(self._starts)
+
+    def min(self) -> int:
+        if not self._starts:
+            raise ValueError("Empty interval set has no minimum")
+        return self._starts[0]
+
+    def max(self) -> int:
+        if not self._ends:
+            raise ValueError("Empty interval set has no maximum")
+        return self._ends[-1]
+
+    def members(self, points: Iterable[int]) -> list[int]:
+        """Returns the points that belong to the set, sorted.
+
+        The points are sorted once and swept together with the intervals, instead
+        of searching the intervals for each point.
+        """
+        result = []
+        starts, ends = self._starts, self._ends
+        idx, total = 0, len(starts)
+
+        for point in sorted(points):
+            while idx < total and ends[idx] < point:
+                idx += 1
+            if idx == total:
+                break
+            if starts[idx] <= point:
+                result.append(point)
+
+        return result
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet._from_sorted(merge(self, other))
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        result: list[Interval] = []
+        a, b = list(self), list(other)
+        i = j = 0
+
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            end = min(a[i][1], b[j][1])
+            if start <= end:
+                result.append((start, end))
+            # Drop the interval that ends first, it cannot overlap anything else
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+
+        return IntervalSet._from_sorted(result)
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        result: list[Interval] = []
+        starts, ends = other._starts, other._ends
+
+        for start, end in self:
+            # First interval of `other` that may overlap with [start, end]
+            idx = bisect_left(ends, start)
+            while idx < len(starts) and starts[idx] <= end:
+                if starts[idx] > start:
+                    result.append((start, starts[idx] - 1))
+                start = ends[idx] + 1
+                idx += 1
+            if start <= end:
+                result.append((start, end))
+
+        return IntervalSet._from_sorted(result)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+
+class IntervalMap:
+    """Piecewise offset mapping over the integers.
+
+    Points inside one of the source intervals are shifted by its offset, any other
+    point maps to itself. The mapping is stored as sorted breakpoints, where
+    `offsets[i]` applies to points in `[breaks[i - 1], breaks[i])`.
+    """
+
+    __slots__ = ("_breaks", "_offsets")
+
+    def __init__(self, pieces: Iterable[tuple[int, int, int]] = ()) -> None:
+        """
+        :param pieces: non overlapping `(start, end, offset)` triples, where `start`
+            and `end` are inclusive
+        """
+        breaks: list[int] = []
+        offsets = [0]
+
+        for start, end, offset in sorted(pieces):
+            if start > end:
+                raise ValueError(f"Invalid interval: {(start, end)}")
+            if breaks and start < breaks[-1]:
+                raise ValueError(f"Overlapping interval: {(start, end)}")
+            if breaks and start == breaks[-1]:
+                offsets[-1] = offset
+            else:
+                breaks.append(start)
+                offsets.append(offset)
+            breaks.append(end + 1)
+            offsets.append(0)
+
+        self._breaks = breaks
+        self._offsets = offsets
+
+    @classmethod
+    def _from_breaks(cls, breaks: list[int], offsets: list[int]) -> "IntervalMap":
+        """Builds a map from breakpoints, dropping the ones that do not change the
+        offset"""
+        result = cls()
+        result._offsets[0] = offsets[0]
+        for point, offset in zip(breaks, offsets[1:], strict=True):
+            if offset != result._offsets[-1]:
+                result._breaks.append(point)
+                result._offsets.append(offset)
+        return result
+
+    @property
+    def breaks(self) -> list[int]:
+        return self._breaks
+
+    @property
+    def offsets(self) -> list[int]:
+        return self._offsets
+
+    def __getitem__(self, point: int) -> int:
+        return point + self._offsets[bisect_right(self._breaks, point)]
+
+    def compose(self, other: "IntervalMap") -> "IntervalMap":
+        """Returns a single map equivalent to applying this map, then `other`.
+
+        Each piece of this map is split where its image crosses one of the
+        breakpoints of `other`.
+        """
+        other_breaks, other_offsets = other._breaks, other._offsets
+        breaks: list[int] = []
+        offsets: list[int] = []
+
+        lows = [None, *self._breaks]
+        highs = [*self._breaks, None]
+        for low, high, offset in zip(lows, highs, self._offsets, strict=True):
+            # Breakpoints of `other` that fall inside the image of [low, high)
+            idx = 0 if low is None else bisect_right(other_breaks, low + offset)
+            end = (
+                len(other_breaks)
+                if high is None
+                else bisect_left(other_breaks, high + offset)
+            )
+            if low is not None:
+                breaks.append(low)
+            offsets.append(offset + other_offsets[idx])
+            for i in range(idx, end):
+                breaks.append(other_breaks[i] - offset)
+                offsets.append(offset + other_offsets[i + 1])
+
+        return IntervalMap._from_breaks(breaks, offsets)
+
+    def min_image(self, intervals: IntervalSet) -> int:
+        """Returns the lowest value any point of `intervals` is mapped to.
+
+        Each piece is shifted by a constant offset, so its lowest value comes from
+        its leftmost point: only the start of each interval and the breakpoints
+        inside of it need to be checked, in a single sweep over both.
+        """
+        if not intervals:
+            raise ValueError("Empty interval set has no minimum")
+
+        breaks, offsets = self._breaks, self._offsets
+        idx, total = 0, len(breaks)
+        lowest: int | None = None
+
+        for start, end in intervals:
+            while idx < total and breaks[idx] <= start:
+                idx += 1
+            value = start + offsets[idx]
+            lowest = value if lowest is None else min(lowest, value)
+            while idx < total and breaks[idx] <= end:
+                lowest = min(lowest, breaks[idx] + offsets[idx + 1])
+                idx += 1
+
+        assert lowest is not None
+        return lowest
+
+    def map_intervals(self, intervals: IntervalSet) -> IntervalSet:
+        """Maps every point of `intervals`, splitting intervals at the breakpoints"""
+        breaks, offsets = self._breaks, self._offsets
+        result: list[Interval] = []
+
+        for start, end in intervals:
+            idx = bisect_right(breaks, start)
+            while idx < len(breaks) and breaks[idx] <= end:
+                result.append((start + offsets[idx], breaks[idx] - 1 + offsets[idx]))
+                start = breaks[idx]
+                idx += 1
+            result.append((start + offsets[idx], end + offsets[idx]))
+
+        return IntervalSet(result)
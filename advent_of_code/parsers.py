@@ -1,8 +1,10 @@
 from typing import Callable
+from typing import Generic
 from typing import Iterable
 from typing import TypeVar
 
 TItem = TypeVar("TItem")
+TValue = TypeVar("TValue")
 
 
 TransformerFuncTypeDef = Callable[[str], TItem]
@@ -17,3 +19,90 @@ def parse_lines(
 
 def parse_ints(s: str) -> list[int]:
     return list(int(n) for n in s.splitlines())
+
+
+class MultiPatternMatcher(Generic[TValue]):
+    """
+    Finds occurrences of several patterns at once, with an Aho-Corasick automaton.
+
+    Every state stores the longest and the shortest pattern that ends there, including
+    those reached through its failure links, so the earliest and latest starting
+    matches are known after a single pass over the text.
+    """
+
+    def __init__(self, patterns: dict[str, TValue]) -> None:
+        if not patterns or "" in patterns:
+            raise ValueError("Patterns must be non empty strings")
+
+        self._goto: list[dict[str, int]] = [{}]
+        own: list[str | None] = [None]
+
+        for pattern in patterns:
+            state = 0
+            for c in pattern:
+                if c not in self._goto[state]:
+                    self._goto.append({})
+                    own.append(None)
+                    self._goto[state][c] = len(self._goto) - 1
+                state = self._goto[state][c]
+            own[state] = pattern
+
+        total = len(self._goto)
+        self._fail = [0] * total
+        # Longest and shortest pattern ending at each state, "" if there is none
+        self._longest = [""] * total
+        self._shortest = [""] * total
+
+        queue = list(self._goto[0].values())
+        for state in queue:  # Breadth first, the queue grows while iterating
+            fail = self._fail[state]
+            pattern = own[state]
+            self._longest[state] = pattern or self._longest[fail]
+            self._shortest[state] = self._shortest[fail] or pattern or ""
+            for c, child in self._goto[state].items():
+                self._fail[child] = self._next_state(fail, c)
+                queue.append(child)
+
+        self._patterns = patterns
+
+    def _next_state(self, state: int, c: str) -> int:
+        goto, fail = self._goto, self._fail
+        while c not in goto[state] and state:
+            state = fail[state]
+        return goto[state].get(c, 0)
+
+    def find_first_last(
+        self, text: str
+    ) -> tuple[tuple[int, TValue], tuple[int, TValue]] | None:
+        """
+        Finds the match that starts first and the match that starts last in a single
+        pass over `text`.
+
+        :param text: the text to search in
+        :return: `(start, value)` of the first and the last match, or None when no
+            pattern occurs in `text`
+        """
+        longest, shortest = self._longest, self._shortest
+        next_state = self._next_state
+        first: tuple[int, str] | None = None
+        last: tuple[int, str] | None = None
+
+        state = 0
+        for end, c in enumerate(text, start=1):
+            state = next_state(state, c)
+            if not longest[state]:
+                continue
+            start = end - len(longest[state])
+            if first is None or start < first[0]:
+                first = start, longest[state]
+            start = end - len(shortest[state])
+            if last is None or start > last[0]:
+                last = start, shortest[state]
+
+        if first is None or last is None:
+            return None
+
+        return (
+            (first[0], self._patterns[first[1]]),
+            (last[0], self._patterns[last[1]]),
+        )
@@ -0,0 +1,112 @@
+from bisect import bisect_right
+from itertools import pairwise
+from math import gcd
+from typing import Sequence
+from typing import TypeAlias
+
+Point: TypeAlias = tuple[int, int]
+# Non horizontal edge as (x1, y1, x2, y2), where y1 < y2
+Edge: TypeAlias = tuple[int, int, int, int]
+
+
+def _closed_edges(vertices: Sequence[Point]) -> list[tuple[Point, Point]]:
+    """Edges between consecutive vertices, closing the polygon if needed"""
+    if len(vertices) < 3:
+        raise ValueError("A polygon needs at least 3 vertices")
+    if vertices[0] == vertices[-1]:
+        return list(pairwise(vertices))
+    return list(pairwise([*vertices, vertices[0]]))
+
+
+def get_double_area(vertices: Sequence[Point]) -> int:
+    """
+    Returns twice the area of a simple polygon, using the shoelace formula.
+
+    The polygon may be closed or not, i.e. the first vertex may be repeated at the end.
+    """
+    return abs(sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in _closed_edges(vertices)))
+
+
+def get_boundary_points(vertices: Sequence[Point]) -> int:
+    """Returns the number of lattice points on the edges of the polygon"""
+    return sum(gcd(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in _closed_edges(vertices))
+
+
+def get_interior_points(vertices: Sequence[Point]) -> int:
+    """
+    Returns the number of lattice points strictly inside of the polygon.
+
+    By Pick's theorem `A = I + B / 2 - 1`, where `I` are the interior points and `B`
+    the points on the boundary, so only the vertices need to be visited.
+    """
+    return (get_double_area(vertices) - get_boundary_points(vertices) + 2) // 2
+
+
+class Polygon:
+    """
+    Simple polygon with integer vertices, prepared for point queries.
+
+    The non horizontal edges are bucketed into the horizontal slabs between
+    consecutive vertex rows, so testing a point only casts a ray against the edges
+    that cross its row.
+    """
+
+    def __init__(self, vertices: Sequence[Point]) -> None:
+        edges = _closed_edges(vertices)
+
+        self._points = [start for start, _ in edges]
+        self._vertices = set(self._points)
+        self._horizontal: dict[int, list[tuple[int, int]]] = {}
+        sloped: list[Edge] = []
+
+        for (x1, y1), (x2, y2) in edges:
+            if y1 == y2:
+                self._horizontal.setdefault(y1, []).append((min(x1, x2), max(x1, x2)))
+            elif y1 < y2:
+                sloped.append((x1, y1, x2, y2))
+            else:
+                sloped.append((x2, y2, x1, y1))
+
+        # Slab `i` holds the points with `rows[i] <= y < rows[i + 1]`
+        self._rows = sorted({y for _, y in self._vertices})
+        self._slabs: list[list[Edge]] = [
+            [e for e in sloped if e[1] <= low and e[3] >= high]
+            for low, high in pairwise(self._rows)
+        ]
+
+    @property
+    def double_area(self) -> int:
+        return get_double_area(self._points)
+
+    @property
+    def boundary_points(self) -> int:
+        return get_boundary_points(self._points)
+
+    @property
+    def interior_points(self) -> int:
+        return get_interior_points(self._points)
+
+    def contains(self, point: Point) -> bool:
+        """Checks if a point is inside of the polygon or on its boundary"""
+        if point in self._vertices:
+            return True
+
+        x, y = point
+        for left, right in self._horizontal.get(y, ()):
+            if left <= x <= right:
+                return True
+
+        slab = bisect_right(self._rows, y) - 1
+        if slab < 0 or slab >= len(self._slabs):
+            return False
+
+        crossings = 0
+        for x1, y1, x2, y2 in self._slabs[slab]:
+            # Compare x with the edge at height y, without dividing
+            side = (x - x1) * (y2 - y1) - (x2 - x1) * (y - y1)
+            if side == 0:
+                return True  # On the edge
+            if side < 0:
+                crossings += 1
+
+        return crossings % 2 == 1
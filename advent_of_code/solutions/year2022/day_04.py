@@ -5,6 +5,9 @@ import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
+from advent_of_code.intervals import Interval
+from advent_of_code.intervals import contains
+from advent_of_code.intervals import overlaps
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -12,7 +15,7 @@ from advent_of_code.utilities import get_input_data
 YEAR = 2022
 DAY = 4
 
-Range: TypeAlias = tuple[int, int]
+Range: TypeAlias = Interval
 Pair: TypeAlias = tuple[Range, Range]
 
 
@@ -26,28 +29,8 @@ def parse_input(s: str) -> Iterable[Pair]:
         yield parse_range(r_1), parse_range(r_2)
 
 
-def inside(r1: Range, r2: Range) -> bool:
-    a1, b1 = r1
-    a2, b2 = r2
-
-    assert a1 <= b1
-    assert a2 <= b2
-
-    return a1 >= a2 and b1 <= b2
-
-
 def inside_any(r1: Range, r2: Range) -> bool:
-    return inside(r1, r2) or inside(r2, r1)
-
-
-def overlaps(r1: Range, r2: Range) -> bool:
-    a1, b1 = r1
-    a2, b2 = r2
-
-    assert a1 <= b1
-    assert a2 <= b2
-
-    return (a2 <= a1 <= b2) or (a2 <= b1 <= b2) or inside_any(r1, r2)
+    return contains(r1, r2) or contains(r2, r1)
 
 
 @aoc.solution(year=YEAR, day=DAY)
@@ -1,3 +1,6 @@
+from array import array
+from typing import Iterable
+
 import pytest
 
 from advent_of_code.core import aoc
@@ -8,118 +11,101 @@ from advent_of_code.utilities import get_input_data
 YEAR = 2022
 DAY = 7
 
-
-TFileObject = dict[str, dict[str, "TFileObject"] | int]
-
-
-def is_dir(fo: TFileObject) -> bool:
-    return isinstance(fo, dict)
-
-
-def print_directory(fo: TFileObject) -> None:
-    def _print(f: TFileObject, level: int = 0) -> None:
-        for k, v in f.items():
-            space = "    " * level
-            if isinstance(v, int):
-                print(f"{space}- {k} (file, size={v})")
-            else:
-                print(f"{space}- {k}  (dir)")
-                _print(v, level + 1)
-
-    if isinstance(fo, int):
-        print(fo)
-    else:
-        _print(fo)
-
-
-def build_directory(commands: list[str]) -> TFileObject:
-    directory: TFileObject = {"/": {}}
-    stack: list[TFileObject] = [directory["/"]]
-
-    for command in commands:
-        match command.split():
-            case ["$", "cd", dir_name]:
-                if dir_name == "..":
-                    if not stack:
-                        raise ValueError("Cannot 'cd ..' as it is already at root")
-                    stack.pop()
-                else:
-                    if dir_name == "/":
-                        # special case
-                        pass
-                    else:
-                        if not stack:
-                            raise ValueError(
-                                f"No current dir to point to: {command}, stack is empty"
-                            )
-                        if dir_name not in stack[-1]:
-                            stack[-1][dir_name] = {}
-                        stack.append(stack[-1][dir_name])
-            case ["$", "ls"]:
-                # This means next items will be file entries
-                pass
-            case ["dir", dir_name]:
-                if dir_name not in stack[-1]:
-                    stack[-1][dir_name] = {}
-            case [size, file_name]:
-                stack[-1][file_name] = int(size)
-            case _:
-                raise ValueError(f"Cannot understand statement: {command}")
-
-    return directory
-
-
-def get_dir_sizes(root: TFileObject) -> dict[str, int]:
-    result = {}
-
-    def _get_size_rec(fo: TFileObject, path: str) -> int:
-        size = 0
-        for k, v in fo.items():
-            if is_dir(v):
-                path = path + "." + k
-                dir_size = _get_size_rec(v, path)
-                result[path] = dir_size
-                size += dir_size
-            else:
-                size += v
-
-        return size
-
-    result["/"] = _get_size_rec(root["/"], "/")
-
-    return result
+ROOT = 0
+TOTAL_DISK = 70000000
+REQUIRED_SPACE = 30000000
+
+
+class DirectorySizes:
+    """Total size of every directory, indexed by directory id.
+
+    Directories get an id the first time they are seen, `ROOT` being `/`. Each
+    entry on the stack of open directories keeps the bytes added during the
+    current visit, which are rolled into the parent when leaving it, so every
+    command is handled in constant time regardless of depth. Listing the same file
+    again replaces its previous size.
+    """
+
+    def __init__(self) -> None:
+        self.sizes = array("q", [0])
+        self._dir_ids: dict[tuple[int, str], int] = {}
+        self._file_sizes: dict[tuple[int, str], int] = {}
+        self._stack = [ROOT]
+        self._pending = [0]
+
+    def _get_dir_id(self, name: str) -> int:
+        key = (self._stack[-1], name)
+        dir_id = self._dir_ids.get(key)
+        if dir_id is None:
+            dir_id = self._dir_ids[key] = len(self.sizes)
+            self.sizes.append(0)
+        return dir_id
+
+    def _leave(self) -> None:
+        self._stack.pop()
+        added = self._pending.pop()
+        self.sizes[self._stack[-1]] += added
+        self._pending[-1] += added
+
+    def cd(self, name: str) -> None:
+        if name == "/":
+            self.close()
+        elif name == "..":
+            if len(self._stack) == 1:
+                raise ValueError("Cannot 'cd ..' as it is already at root")
+            self._leave()
+        else:
+            self._stack.append(self._get_dir_id(name))
+            self._pending.append(0)
+
+    def add_dir(self, name: str) -> None:
+        self._get_dir_id(name)
+
+    def add_file(self, name: str, size: int) -> None:
+        key = (self._stack[-1], name)
+        delta = size - self._file_sizes.get(key, 0)
+        self._file_sizes[key] = size
+        self.sizes[self._stack[-1]] += delta
+        self._pending[-1] += delta
+
+    def close(self) -> None:
+        """Goes back to the root, rolling up the sizes of the open directories"""
+        while len(self._stack) > 1:
+            self._leave()
+
+
+def get_dir_sizes(lines: Iterable[str]) -> array:
+    """Returns the total size of every directory, streaming the terminal output once"""
+    directories = DirectorySizes()
+
+    for line in lines:
+        if line.startswith("$ cd "):
+            directories.cd(line[5:])
+        elif line == "$ ls":
+            pass
+        elif line.startswith("dir "):
+            directories.add_dir(line[4:])
+        else:
+            size_s, _, file_name = line.partition(" ")
+            if not size_s.isdigit() or not file_name:
+                raise ValueError(f"Cannot understand statement: {line}")
+            directories.add_file(file_name, int(size_s))
+
+    directories.close()
+    return directories.sizes
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    directory = build_directory(s.splitlines())
-    sizes = get_dir_sizes(directory)
-    part_1 = sum([size for size in sizes.values() if size <= 100000])
-
-    total_disk = 70000000
-    required = 30000000
-    limit = total_disk - required
-
-    total_used_space = sizes["/"]
-
-    found = False
-    min_diff = total_disk
-    folder_result = None
-
-    # find folder that deleted minimizes the diff between used and limit
-    for folder, size in sizes.items():
-        new_unused_space = total_used_space - size
-        if new_unused_space <= limit:
-            diff = limit - new_unused_space
-            if diff < min_diff:
-                min_diff = diff
-                folder_result = folder
-                found = True
-
-    if not found:
-        raise ValueError("Unable to find a suitable folder for part 2")
+    sizes = get_dir_sizes(s.splitlines())
+    part_1 = sum(size for size in sizes if size <= 100000)
 
-    part_2 = sizes[folder_result]
+    # Smallest folder that, once deleted, leaves enough unused space
+    needed = sizes[ROOT] - (TOTAL_DISK - REQUIRED_SPACE)
+    candidates = [size for size in sizes if size >= needed]
+    if not candidates:
+        raise ValueError("Unable to find a suitable folder for part 2")
+    part_2 = min(candidates)
 
     return part_1, part_2
 
@@ -159,5 +145,42 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+def test_get_dir_sizes_siblings_and_revisits() -> None:
+    lines = [
+        "$ cd /",
+        "$ ls",
+        "dir a",
+        "dir b",
+        "10 x",
+        "$ cd a",
+        "$ ls",
+        "1 y",
+        "$ cd ..",
+        "$ cd b",
+        "$ ls",
+        "2 z",
+        "$ cd /",
+        "$ cd a",
+        "$ ls",
+        "1 y",
+        "4 w",
+    ]
+    # Directory ids are assigned in order of discovery: /, a, b
+    assert list(get_dir_sizes(lines)) == [17, 5, 2]
+
+
+def test_get_dir_sizes_deep_nesting() -> None:
+    depth = 10000
+    lines = ["$ cd /"]
+    for i in range(depth):
+        lines.extend(["$ ls", f"dir d{i}", "1 f", f"$ cd d{i}"])
+
+    sizes = get_dir_sizes(lines)
+
+    assert len(sizes) == depth + 1
+    assert sizes[ROOT] == depth
+    assert sizes[-1] == 0
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
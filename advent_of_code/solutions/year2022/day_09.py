@@ -1,6 +1,6 @@
-from enum import auto
+from array import array
 from enum import Enum
-from itertools import pairwise
+from enum import auto
 from typing import Iterable
 from typing import NamedTuple
 from typing import Union
@@ -12,7 +12,6 @@ from advent_of_code.core import print_solution
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
-
 YEAR = 2022
 DAY = 9
 
@@ -72,6 +71,71 @@ class Operation(NamedTuple):
     count: int
 
 
+def _build_follow_table() -> tuple[array, array]:
+    """Move of a knot for each offset to its leader, indexed by
+    `(delta_x + 2) * 5 + delta_y + 2`. Touching knots do not move, otherwise the
+    knot steps one unit along each axis towards the leader."""
+    moves_x = array("b")
+    moves_y = array("b")
+    for delta_x in range(-2, 3):
+        for delta_y in range(-2, 3):
+            touching = abs(delta_x) <= 1 and abs(delta_y) <= 1
+            moves_x.append(0 if touching else sign(delta_x))
+            moves_y.append(0 if touching else sign(delta_y))
+    return moves_x, moves_y
+
+
+FOLLOW_X, FOLLOW_Y = _build_follow_table()
+
+# Positions visited by the tail are packed into a single int
+PACK_SHIFT = 32
+
+
+class Rope:
+    """A chain of knots stored as two coordinate arrays, the head being knot 0"""
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("A rope needs at least one knot")
+        self._xs = array("i", [0] * size)
+        self._ys = array("i", [0] * size)
+        self._tail_visited = {0}
+
+    @property
+    def knots(self) -> list[Point2D]:
+        return [Point2D(x=x, y=y) for x, y in zip(self._xs, self._ys, strict=True)]
+
+    @property
+    def total_tail_visited(self) -> int:
+        return len(self._tail_visited)
+
+    def move(self, direction: Direction, count: int = 1) -> None:
+        """Moves the head `count` steps, one at a time, pulling the other knots.
+
+        Propagation stops at the first knot that does not move, since the knots
+        behind it cannot move either.
+        """
+        xs, ys = self._xs, self._ys
+        tail = len(xs) - 1
+        visited = self._tail_visited
+        step_x, step_y = DIRECTION_OFFSET[direction]
+
+        for _ in range(count):
+            xs[0] += step_x
+            ys[0] += step_y
+
+            for i in range(1, tail + 1):
+                delta = (xs[i - 1] - xs[i] + 2) * 5 + ys[i - 1] - ys[i] + 2
+                move_x = FOLLOW_X[delta]
+                move_y = FOLLOW_Y[delta]
+                if not (move_x or move_y):
+                    break
+                xs[i] += move_x
+                ys[i] += move_y
+            else:
+                visited.add((xs[tail] << PACK_SHIFT) + ys[tail])
+
+
 def print_rope(rope: list[Point2D]) -> None:
     rope_spots = {}
     min_x, max_x, min_y, max_y = None, None, None, None
@@ -97,59 +161,11 @@ def print_rope(rope: list[Point2D]) -> None:
         print("".join(buff))
 
 
-def move_head(point: Point2D, direction: Direction) -> Point2D:
-    return point + DIRECTION_OFFSET[direction]
-
-
-def follow(leader: Point2D, follower: Point2D) -> Point2D:
-    delta_x = leader.x - follower.x
-    delta_y = leader.y - follower.y
-
-    sum_sqr = delta_y * delta_y + delta_x * delta_x
-
-    # Sum of squares from (0, 0) (bottom-left)
-    # XXXX
-    # 458X
-    # 125X
-    # 014X
-    # [0, 1, 2] -> Touching, no need to move
-    # [4, 5, 8] -> Move (orthogonally for 4, diagonal for 5 and 8)
-    # [X] -> Too far, ERROR!
-
-    assert sum_sqr >= 0
-
-    if sum_sqr > 8:
-        raise ValueError(
-            f"'follower' [{follower}] is way to behind 'leader' [{leader}]"
-        )
-
-    if sum_sqr in (0, 1, 2):
-        return follower
-    elif sum_sqr in (4, 5, 8):
-        return Point2D(x=follower.x + sign(delta_x), y=follower.y + sign(delta_y))
-    else:
-        raise ValueError(f"Unexpected sum of square value {sum_sqr}!")
-
-
-def move(rope: list[Point2D], direction: Direction) -> None:
-    rope[0] += DIRECTION_OFFSET[direction]
-
-    for leader_idx, follower_idx in pairwise(range(len(rope))):
-        leader = rope[leader_idx]
-        follower = rope[follower_idx]
-        rope[follower_idx] = follow(leader=leader, follower=follower)
-
-
 def find_total_tail_visited(ops: Iterable[Operation], rope_size: int) -> int:
-    rope = [Point2D(x=0, y=0) for _ in range(rope_size)]
-    tail_visited = {rope[-1]}
-
+    rope = Rope(size=rope_size)
     for op in ops:
-        for _ in range(op.count):
-            move(rope=rope, direction=op.direction)
-            tail_visited.add(rope[-1])
-
-    return len(tail_visited)
+        rope.move(direction=op.direction, count=op.count)
+    return rope.total_tail_visited
 
 
 def parse_input(s: str) -> Iterable[Operation]:
@@ -199,5 +215,14 @@ def test_solve(input_s: str, rope_size: int, expected: tuple[int, int]) -> None:
     assert find_total_tail_visited(ops=ops, rope_size=rope_size) == expected
 
 
+def test_rope_move() -> None:
+    rope = Rope(size=3)
+    rope.move(Direction.RIGHT, count=4)
+    rope.move(Direction.UP, count=2)
+
+    assert rope.knots == [Point2D(4, 2), Point2D(4, 1), Point2D(3, 1)]
+    assert rope.total_tail_visited == 4
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
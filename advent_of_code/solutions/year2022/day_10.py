@@ -1,111 +1,18 @@
-from enum import Enum
-from itertools import cycle
-from typing import cast
-from typing import Iterable
-from typing import TypeAlias
-from typing import Union
-
+import numpy as np
 import pytest
-from more_itertools import chunked
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
-
+from advent_of_code.vm import VM
+from advent_of_code.vm import compile_program
 
 YEAR = 2022
 DAY = 10
 
-
-class OpCode(Enum):
-    NOOP = "noop"
-    ADDX = "addx"
-
-
-Instruction: TypeAlias = Union[OpCode, tuple[OpCode, int]]
-
-
-def instr_str(inst: Instruction) -> str:
-    if isinstance(inst, tuple):
-        return f"{inst[0].value} {inst[1]}"
-    else:
-        return f"{inst.value}"
-
-
-class CPU:
-    """Extremely over-engineered class for the problem at hand"""
-
-    OPCODE_CYCLES = {
-        OpCode.NOOP: 1,
-        OpCode.ADDX: 2,
-    }
-
-    def __init__(self, program: Iterable[Instruction], x: int = 1) -> None:
-        self._program = cycle(program)
-        self._x = x
-        self._cycle = 0
-        self._current_instruction: tuple[Instruction, int] | None = None
-
-    def fetch(self) -> tuple[Instruction, int]:
-        if self._current_instruction is not None:
-            return self._current_instruction
-        else:
-            result = next(self._program)
-            cycles = self.get_cycles(result)
-            return result, cycles
-
-    def step(self) -> tuple[int, int]:
-        next_instruction, cycles_left = self.fetch()
-        cycles_left = cycles_left - 1
-
-        curr_x = self._x
-        if cycles_left == 0:
-            self._execute(next_instruction)
-            self._current_instruction = None
-        else:
-            self._current_instruction = next_instruction, cycles_left
-        curr_cycle = self._cycle
-        self._cycle += 1
-        return curr_x, curr_cycle
-
-    def get_cycles(self, instruction: Instruction) -> int:
-        opcode = self.get_opcode(instruction)
-        return CPU.OPCODE_CYCLES[opcode]
-
-    def get_opcode(self, instruction: Instruction) -> OpCode:
-        if isinstance(instruction, tuple):
-            return instruction[0]
-        else:
-            return instruction
-
-    def _execute(self, instruction: Instruction) -> None:
-        match instruction:
-            case OpCode.NOOP:
-                pass
-            case (OpCode.ADDX, val):
-                val = cast(int, val)
-                self._x += val
-            case _:
-                raise ValueError
-
-    @property
-    def x(self) -> int:
-        return self._x
-
-
-def parse_input(s: str) -> list[Instruction]:
-    parsed: list[Instruction] = []
-    for line in s.splitlines():
-        match line.split():
-            case ["noop"]:
-                parsed.append(OpCode.NOOP)
-            case ["addx", val]:
-                parsed.append((OpCode.ADDX, int(val)))
-            case _:
-                raise ValueError
-
-    return parsed
+SCREEN_WIDTH = 40
+SCREEN_HEIGHT = 6
 
 
 def visualize(data: list[tuple[int, int]]) -> None:
@@ -120,43 +27,32 @@ def visualize(data: list[tuple[int, int]]) -> None:
     plt.show()
 
 
-def draw(data: list[tuple[int, int]]) -> str:
-    if len(data) != 240:
-        raise ValueError("data must have exactly 220 chars")
+def get_signal_strength(trace: np.ndarray, first: int = 20, step: int = 40) -> int:
+    """Sums `cycle * X` for cycles `first`, `first + step`, ... within the trace"""
+    cycles = np.arange(first, len(trace) + 1, step, dtype=np.int64)
+    return int((cycles * trace[cycles - 1]).sum())
 
-    result: list[str] = []
 
-    for clock, x in data:
-        hor = clock % 40
-        sprite = (x - 1, x, x + 1)
-        if hor in sprite:
-            result.append("#")
-        else:
-            result.append(".")
+def draw(trace: np.ndarray) -> str:
+    pixels = SCREEN_WIDTH * SCREEN_HEIGHT
+    if len(trace) < pixels:
+        raise ValueError(f"trace must have at least {pixels} cycles")
 
-    assert len(result) == 240
+    columns = np.arange(pixels) % SCREEN_WIDTH
+    lit = np.abs(trace[:pixels] - columns) <= 1
+    screen = np.where(lit, "#", ".").reshape(SCREEN_HEIGHT, SCREEN_WIDTH)
 
-    return "\n".join("".join(c) for c in chunked(result, 40, strict=True))
+    return "\n".join("".join(row) for row in screen)
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    instructions = parse_input(s)
-    cpu = CPU(program=instructions)
-
-    data = []
-    signal = 0
+    program = compile_program(s.splitlines())
+    vm = VM(program=program)
 
-    for _ in range(240):
-        x, clock = cpu.step()
-        data.append((clock, x))
-        mod = (clock - 20 + 1) % 40
-        if mod == 0:
-            signal += x * (clock + 1)
-        else:
-            pass
+    trace = np.frombuffer(vm.trace(SCREEN_WIDTH * SCREEN_HEIGHT), dtype=np.int64)
 
-    return signal, draw(data)
+    return get_signal_strength(trace[:220]), draw(trace)
 
 
 TEST_INPUT_SMALL = """\
@@ -10,6 +10,7 @@ from typing import Iterable
 from typing import NamedTuple
 from typing import TypeAlias
 
+import numpy as np
 import pytest
 from more_itertools import one
 from more_itertools import take
@@ -25,6 +26,7 @@ DAY = 11
 
 
 OpFuncTypeDef: TypeAlias = Callable[[int], int]
+OpCodeTypeDef: TypeAlias = tuple[str, int]
 WorryReliefFuncTypeDef: TypeAlias = Callable[[int], int]
 
 
@@ -47,10 +49,30 @@ def make_fun(exp: str) -> OpFuncTypeDef:
             raise ValueError(f"Unexpected 'exp': {exp}")
 
 
+def compile_operation(exp: str) -> OpCodeTypeDef:
+    """Compiles an expression into an op code that can be applied to arrays:
+    ("+", value), ("*", value) or ("^", 2) for `old * old`
+    """
+    lh, op, rh = exp.split()
+
+    match (lh, op, rh):
+        case ("old", "*", "old"):
+            return "^", 2
+        case ("old", "+", "old"):
+            return "*", 2
+        case ("old", _, value) | (value, _, "old"):
+            if op not in ("+", "*"):
+                raise ValueError(f"Unexpected 'exp': {exp}")
+            return op, int(value)
+        case _:
+            raise ValueError(f"Unexpected 'exp': {exp}")
+
+
 class Monkey(NamedTuple):
     monkey_id: int
     items: Deque
     operation: Callable[[int], int]
+    expression: str
     test: int
     true_case: int
     false_case: int
@@ -83,6 +105,7 @@ def parse_input(s: str) -> Iterable[Monkey]:
             monkey_id=monkey_id,
             items=deque(items),
             operation=make_fun(expression),
+            expression=expression,
             test=test_div,
             true_case=true_case,
             false_case=false_case,
@@ -123,6 +146,118 @@ def monkey_business(
     )
 
 
+def apply_operation(worry: np.ndarray, op_code: OpCodeTypeDef) -> np.ndarray:
+    op, value = op_code
+    if op == "+":
+        return worry + value
+    elif op == "*":
+        return worry * value
+    else:
+        return worry * worry
+
+
+def extrapolate_counts(
+    history: list[np.ndarray],
+    cycles: dict[int, tuple[int, int]],
+    total_rounds: int,
+) -> list[int]:
+    """Adds up the inspections of every item after `total_rounds`, given the
+    cumulative counts per round and the cycle of each item
+    """
+    result = [0] * history[0].shape[1]
+
+    for item, (cycle_start, cycle_length) in cycles.items():
+        full_cycles, remainder = divmod(total_rounds - cycle_start, cycle_length)
+        before = history[cycle_start][item].tolist()
+        after_cycle = history[cycle_start + cycle_length][item].tolist()
+        after_remainder = history[cycle_start + remainder][item].tolist()
+
+        for monkey_id, (b, c, r) in enumerate(
+            zip(before, after_cycle, after_remainder, strict=True)
+        ):
+            result[monkey_id] += b + full_cycles * (c - b) + (r - b)
+
+    return result
+
+
+def get_state_radix(divisors: list[int]) -> np.ndarray:
+    """Returns the weights that pack the residues of an item into a single int,
+    leaving room for the owner in the lowest digit
+    """
+    weights = [len(divisors)]
+    for d in divisors:
+        weights.append(weights[-1] * d)
+    if weights[-1] >= 2**63:
+        raise ValueError("Divisors are too large to pack the item states")
+    return np.array(weights[:-1], dtype=np.int64)
+
+
+def get_inspection_counts(monkeys: list[Monkey], total_rounds: int) -> list[int]:
+    """Counts inspections per monkey when there is no worry relief.
+
+    Each item is tracked as its monkey and a vector with its worry level modulo
+    every monkey's divisor, which is all that is needed to apply the operations and
+    tests. Items never interact, so each item cycles through (monkey, residues)
+    states on its own. The simulation stops once every item has repeated a state,
+    and the counts for the remaining rounds are extrapolated from the cycles.
+    """
+    total_monkeys = len(monkeys)
+    divisors = np.array([m.test for m in monkeys], dtype=np.int64)
+    op_codes = [compile_operation(m.expression) for m in monkeys]
+    true_cases = np.array([m.true_case for m in monkeys], dtype=np.int64)
+    false_cases = np.array([m.false_case for m in monkeys], dtype=np.int64)
+
+    items = [(m.monkey_id, item) for m in monkeys for item in m.items]
+    total_items = len(items)
+    owners = np.array([owner for owner, _ in items], dtype=np.int64)
+    residues = np.array(
+        [[item % d for d in divisors.tolist()] for _, item in items], dtype=np.int64
+    ).reshape(total_items, total_monkeys)
+
+    radix = get_state_radix(divisors.tolist())
+
+    def get_states() -> list[int]:
+        return (owners + residues @ radix).tolist()
+
+    counts = np.zeros((total_items, total_monkeys), dtype=np.int64)
+    history = [counts.copy()]
+    seen: list[dict[int, int]] = [{state: 0} for state in get_states()]
+    cycles: dict[int, tuple[int, int]] = {}  # item -> (cycle start, cycle length)
+
+    rnd = 0
+    while rnd < total_rounds and len(cycles) < total_items:
+        for monkey_id, op_code in enumerate(op_codes):
+            # Items thrown to a later monkey are inspected again in this round
+            mask = owners == monkey_id
+            if not mask.any():
+                continue
+            worry = apply_operation(residues[mask], op_code) % divisors
+            residues[mask] = worry
+            counts[mask, monkey_id] += 1
+            owners[mask] = np.where(
+                worry[:, monkey_id] == 0,
+                true_cases[monkey_id],
+                false_cases[monkey_id],
+            )
+
+        rnd += 1
+        history.append(counts.copy())
+
+        for item, state in enumerate(get_states()):
+            if item in cycles:
+                continue
+            if state in seen[item]:
+                cycle_start = seen[item][state]
+                cycles[item] = (cycle_start, rnd - cycle_start)
+            else:
+                seen[item][state] = rnd
+
+    if total_rounds <= rnd:
+        return history[total_rounds].sum(axis=0).tolist()
+
+    return extrapolate_counts(history, cycles=cycles, total_rounds=total_rounds)
+
+
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
     monkeys_1 = list(parse_input(s))
@@ -136,19 +271,9 @@ def solve(s: str) -> Solution:
         worry_relief_func=worry_relief_func_1,
     )
 
-    prod = reduce(operator.mul, (m.test for m in monkeys_1))
-
     monkeys_2 = list(parse_input(s))
-
-    def worry_relief_func_2(x: int) -> int:
-        return x
-
-    part_2 = monkey_business(
-        monkeys=monkeys_2,
-        total_rounds=10000,
-        worry_relief_func=worry_relief_func_2,
-        mod=prod,
-    )
+    counts = get_inspection_counts(monkeys=monkeys_2, total_rounds=10000)
+    part_2 = reduce(operator.mul, take(2, sorted(counts, reverse=True)), 1)
 
     return part_1, part_2
 
@@ -192,5 +317,33 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+@pytest.mark.parametrize(
+    ("total_rounds", "expected"),
+    (
+        (1, [2, 4, 3, 6]),
+        (20, [99, 97, 8, 103]),
+        (1000, [5204, 4792, 199, 5192]),
+        (10000, [52166, 47830, 1938, 52013]),
+    ),
+)
+def test_get_inspection_counts(total_rounds: int, expected: list[int]) -> None:
+    monkeys = list(parse_input(TEST_INPUT))
+    assert get_inspection_counts(monkeys, total_rounds=total_rounds) == expected
+
+
+def test_get_inspection_counts_matches_lcm_simulation() -> None:
+    prod = reduce(operator.mul, (m.test for m in parse_input(TEST_INPUT)))
+
+    expected = monkey_business(
+        monkeys=list(parse_input(TEST_INPUT)),
+        total_rounds=5000,
+        worry_relief_func=lambda x: x,
+        mod=prod,
+    )
+    counts = get_inspection_counts(list(parse_input(TEST_INPUT)), total_rounds=5000)
+
+    assert reduce(operator.mul, take(2, sorted(counts, reverse=True)), 1) == expected
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
@@ -3,11 +3,11 @@ from typing import Iterable
 
 import pytest
 
-from advent_of_code.algorithms.astar import a_star_search
 from advent_of_code.algorithms.astar import PathNotFoundError
+from advent_of_code.algorithms.bfs import get_distances_to
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
-from advent_of_code.type_defs import Coord2D
+from advent_of_code.grids import Coord2D
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -130,75 +130,56 @@ def visualize(
     plt.show()
 
 
-def find_shortest_path(
-    grid: list[list[int]],
-    start: Coord2D,
-    goal: Coord2D,
-    max_cost: int | None = None,
-) -> Iterable[tuple[Coord2D, int]]:
-    height = len(grid)
+def get_distances_to_end(grid: list[list[int]], end: Coord2D) -> list[list[int | None]]:
+    """Returns the number of steps to `end` from every location, or `None` for the
+    locations that cannot reach it.
+
+    A single reverse BFS is run from `end`: a step from `a` to `b` is allowed when `b`
+    is at most one higher than `a`, so walking backwards from `b` goes to neighbors
+    at least one lower than it. Cells are addressed as `y * width + x` while
+    searching.
+    """
     width = len(grid[0])
+    heights = bytearray(h for row in grid for h in row)
+    size = len(heights)
 
-    def get_adjacent(location: Coord2D) -> Iterable[tuple[Coord2D, int]]:
-        offsets = ((1, 0), (-1, 0), (0, 1), (0, -1))
-        current_height = grid[location.y][location.x]
-        for offset in offsets:
-            new_location = location + offset
-            if (
-                new_location.x < 0
-                or new_location.x >= width
-                or new_location.y < 0
-                or new_location.y >= height
-            ):
-                continue
-            new_height = grid[new_location.y][new_location.x]
-            diff = new_height - current_height
-            if diff > 1:
-                continue
-            yield new_location, 1
-
-    def heuristic(a: Coord2D, b: Coord2D) -> int:
-        return abs(b.y - a.y) + abs(b.x - a.x)
-
-    result = a_star_search(
-        start=start,
-        goal=goal,
-        get_adjacent=get_adjacent,
-        heuristic=heuristic,
-        max_cost=max_cost,
-    )
+    def get_predecessors(i: int) -> Iterable[int]:
+        min_height = heights[i] - 1
+        x = i % width
+        if x > 0 and heights[i - 1] >= min_height:
+            yield i - 1
+        if x < width - 1 and heights[i + 1] >= min_height:
+            yield i + 1
+        if i >= width and heights[i - width] >= min_height:
+            yield i - width
+        if i + width < size and heights[i + width] >= min_height:
+            yield i + width
+
+    flat: list[int | None] = [None] * size
+    for i, d in get_distances_to(end.y * width + end.x, get_predecessors).items():
+        flat[i] = d
 
-    return result
+    return [flat[row : row + width] for row in range(0, size, width)]
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
     grid, start, end = parse_input(s)
+    distances = get_distances_to_end(grid=grid, end=end)
+
+    part_1 = distances[start.y][start.x]
+    if part_1 is None:
+        raise PathNotFoundError(f"No path from {start} to {end}")
+
+    # Closest location with height = "a" (0)
+    part_2 = min(
+        d
+        for heights, row in zip(grid, distances, strict=True)
+        for h, d in zip(heights, row, strict=True)
+        if h == 0 and d is not None
+    )
 
-    path_1 = find_shortest_path(grid=grid, start=start, goal=end)
-    part_1 = len(list(path_1)) - 1
-
-    # Get all start locations with height = "a" (0)
-    start_locations: list[Coord2D] = []
-    for row, line in enumerate(grid):
-        for col, h in enumerate(line):
-            if h == 0:
-                start_locations.append(Coord2D(x=col, y=row))
-
-    max_cost: int | None = None
-    for start in start_locations:
-        try:
-            path_2 = find_shortest_path(
-                grid=grid, start=start, goal=end, max_cost=max_cost
-            )
-            current_cost = len(list(path_2))
-            max_cost = min(max_cost or current_cost, current_cost)
-        except PathNotFoundError:
-            pass
-
-    assert max_cost is not None
-
-    return part_1, max_cost - 1
+    return part_1, part_2
 
 
 TEST_INPUT = """\
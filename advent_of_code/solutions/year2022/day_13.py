@@ -1,4 +1,5 @@
-from functools import cmp_to_key
+import re
+from array import array
 from typing import Iterable
 from typing import TypeAlias
 
@@ -14,6 +15,13 @@ YEAR = 2022
 DAY = 13
 
 TInput: TypeAlias = list["TInput"] | int
+SortKey: TypeAlias = tuple[int, ...]
+
+OPEN = -1
+CLOSE = -2
+EMPTY_LIST_OFFSET = 2**63
+
+TOKEN_RE = re.compile(r"\d+|\[|\]")
 
 
 def compare(left: TInput, right: TInput) -> int:
@@ -46,40 +54,129 @@ def compare(left: TInput, right: TInput) -> int:
             return compare(left, [right])
 
 
-def parse_input(s: str) -> Iterable[tuple[TInput, TInput]]:
+def tokenize(packet: str) -> array:
+    """Encodes a packet as a flat token array: `OPEN`, `CLOSE` or an integer"""
+    return array(
+        "q",
+        (
+            OPEN if t == "[" else CLOSE if t == "]" else int(t)
+            for t in TOKEN_RE.findall(packet)
+        ),
+    )
+
+
+def _peek(tokens: array, pos: int, injected: list[int]) -> int:
+    return injected[-1] if injected else tokens[pos]
+
+
+def _advance(pos: int, injected: list[int]) -> int:
+    """Moves past the current token, returning the new position in the array"""
+    if injected:
+        injected.pop()
+        return pos
+    return pos + 1
+
+
+def _promote(token: int, pos: int, injected: list[int]) -> int:
+    """Replaces the current integer token by a list holding only that integer"""
+    pos = _advance(pos, injected)
+    injected.extend((CLOSE, token, OPEN))
+    return pos
+
+
+def compare_packets(left: array, right: array) -> int:
+    """Same as `compare`, streaming over token arrays without building lists.
+
+    When an integer meets a list, the integer is replaced by `OPEN, n, CLOSE` on a
+    small stack of injected tokens for that side, instead of wrapping it in a list.
+    """
+    i = j = 0
+    left_injected: list[int] = []
+    right_injected: list[int] = []
+
+    while True:
+        a = _peek(left, i, left_injected)
+        b = _peek(right, j, right_injected)
+
+        if a >= 0 and b >= 0:
+            if a != b:
+                return 1 if a < b else -1
+        elif a != b:
+            if a == CLOSE:
+                return 1  # Left side ran out of elements
+            if b == CLOSE:
+                return -1  # Right side ran out of elements
+            if a >= 0:  # Integer vs list
+                i = _promote(a, i, left_injected)
+            else:  # List vs integer
+                j = _promote(b, j, right_injected)
+            continue
+
+        # Same integer, or both open or both close a list
+        i = _advance(i, left_injected)
+        j = _advance(j, right_injected)
+
+        if i == len(left) and not left_injected:
+            return 0
+
+
+def get_sort_key(tokens: array) -> SortKey:
+    """Builds a flat tuple of ints that sorts like the packet.
+
+    Every leaf (an integer, or an empty list) contributes two values: the leaf and
+    the depth of the list that is still open after the closing brackets that follow
+    it. Since an integer compares like a list holding only that integer, the
+    brackets opened before a leaf never matter, only how many lists are closed
+    after it: closing more lists means running out of elements first, which sorts
+    lower. An empty list ranks below any integer, and an empty list at a
+    shallower depth ran out earlier.
+    """
+    key: list[int] = []
+    depth = -1
+    previous = CLOSE
+
+    for t in tokens:
+        if t == OPEN:
+            depth += 1
+        elif t == CLOSE:
+            if previous == OPEN:
+                key.append(depth - EMPTY_LIST_OFFSET)
+                key.append(depth)
+            depth -= 1
+            key[-1] = depth
+        else:
+            key.append(t)
+            key.append(depth)
+        previous = t
+
+    return tuple(key)
+
+
+def parse_input(s: str) -> Iterable[tuple[array, array]]:
     for chunk in s.split("\n\n"):
         left, right = chunk.splitlines()
-        yield eval(left), eval(right)
+        yield tokenize(left), tokenize(right)
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    packets = list(parse_input(s))
+    pairs = list(parse_input(s))
 
     part_1 = sum(
         idx + 1
-        for idx, res in enumerate([compare(l, r) for l, r in packets])
-        if res == 1
+        for idx, (left, right) in enumerate(pairs)
+        if compare_packets(left, right) == 1
     )
 
-    all_packets = [packet for pair in packets for packet in pair]
-    all_packets.append([[2]])
-    all_packets.append([[6]])
-    all_packets.sort(key=cmp_to_key(compare), reverse=True)
-
-    idx_1 = -1
-    idx_2 = -1
-
-    for i, p in enumerate(all_packets):
-        if p == [[2]]:
-            idx_1 = i
-        if p == [[6]]:
-            idx_2 = i
+    divider_keys = [get_sort_key(tokenize("[[2]]")), get_sort_key(tokenize("[[6]]"))]
+    keys = [get_sort_key(packet) for pair in pairs for packet in pair]
 
-    assert idx_1 >= 0
-    assert idx_2 >= 0
+    # Only the positions of the dividers are needed, which is the number of
+    # packets sorting before them (dividers are in order with each other)
+    idx_1 = sum(1 for k in keys if k < divider_keys[0]) + 1
+    idx_2 = sum(1 for k in keys if k < divider_keys[1]) + 2
 
-    part_2 = (idx_1 + 1) * (idx_2 + 1)
+    part_2 = idx_1 * idx_2
 
     return part_1, part_2
 
@@ -138,6 +235,38 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
 )
 def test_compare(left: TInput, right: TInput, expected: int) -> None:
     assert compare(left, right) == expected
+    left_tokens, right_tokens = tokenize(str(left)), tokenize(str(right))
+    assert compare_packets(left_tokens, right_tokens) == expected
+
+    left_key = get_sort_key(left_tokens)
+    right_key = get_sort_key(right_tokens)
+    assert (left_key < right_key) - (left_key > right_key) == expected
+
+
+def test_get_sort_key_orders_packets() -> None:
+    packets = [line for line in TEST_INPUT.splitlines() if line]
+    packets.extend(["[[2]]", "[[6]]"])
+
+    assert sorted(packets, key=lambda p: get_sort_key(tokenize(p))) == [
+        "[]",
+        "[[]]",
+        "[[[]]]",
+        "[1,1,3,1,1]",
+        "[1,1,5,1,1]",
+        "[[1],[2,3,4]]",
+        "[1,[2,[3,[4,[5,6,0]]]],8,9]",
+        "[1,[2,[3,[4,[5,6,7]]]],8,9]",
+        "[[1],4]",
+        "[[2]]",
+        "[3]",
+        "[[4,4],4,4]",
+        "[[4,4],4,4,4]",
+        "[[6]]",
+        "[7,7,7]",
+        "[7,7,7,7]",
+        "[[8,7,6]]",
+        "[9]",
+    ]
 
 
 if __name__ == "__main__":
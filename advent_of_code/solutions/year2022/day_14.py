@@ -6,8 +6,8 @@ import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
+from advent_of_code.grids import Coord2D
 from advent_of_code.recipes import trace_points
-from advent_of_code.type_defs import Coord2D
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -127,95 +127,139 @@ def get_total_sand_broken(start: Coord2D, structure: set[Coord2D]) -> set[Coord2
     return result
 
 
-def get_total_sand(  # noqa: max-complexity: 14
-    drop_point: Coord2D, lines: list[Line]
-) -> set[Coord2D]:
-    """Calculates sand falling from the specified 'drop_point'. This does a basic
-    simulation based on the rules of the problem.
+class Cave:
+    """Cave scan stored as a flat `bytearray` indexed by `y * width + (x - min_x)`.
 
-        Remarks:
-        - Likely does not work with other origin points
-        - Part 2 can be optimized (and part 1 as well)
+    The grid spans every row a grain can rest on (`0..max_y + 1`) and is wide
+    enough for the pile under the drop point to spread one cell per row, so a
+    falling grain never needs bounds checks on `x`. When `has_floor` is set, the
+    (infinite) floor sits right below the last row.
     """
 
-    def get_points(point: Coord2D) -> Iterable[Coord2D]:
-        """Get points in order"""
-        yield from (point + offset for offset in ((0, 1), (-1, 1), (1, 1)))
-
-    # Create structure with lines
-    structure: set[Coord2D] = set()
-
-    for line in lines:
-        if line.p_1.x == line.p_2.x:
-            for y in trace_points(line.p_1.y, line.p_2.y):
-                structure.add(Coord2D(line.p_1.x, y))
-        else:
-            for x in trace_points(line.p_1.x, line.p_2.x):
-                structure.add(Coord2D(x, line.p_1.y))
-
-    all_sand: set[Coord2D] = set()
-    max_y = max(p.y for p in structure)
-
-    found_floor = False
-
-    while not found_floor:
-        # Get next grain of sand
-        sand = drop_point
-
-        if sand in structure:
-            # drop point is clogged we can break!
-            break
-
-        while True:
-            if sand.y >= max_y:
-                found_floor = True  # Sand is not settled, and won't be
-                break
-
-            bottom, bottom_left, bottom_right = get_points(sand)
-
-            if bottom in structure:
-                if bottom_left in structure and bottom_right in structure:
-                    # We can settle sand at this point
-                    all_sand.add(sand)
-                    structure.add(sand)
-                    break
-                else:
-                    if bottom_left not in structure:
-                        sand += (-1, 1)
-                        continue
-                    if bottom_right not in structure:
-                        sand += (1, 1)
-                        continue
+    EMPTY = 0
+    ROCK = 1
+    SAND = 2
+
+    def __init__(
+        self, lines: Iterable[Line], drop_point: Coord2D, has_floor: bool = False
+    ) -> None:
+        lines = list(lines)
+        points = [p for line in lines for p in (line.p_1, line.p_2)]
+        max_y = max(p.y for p in points)
+
+        self._rows = max_y + 2
+        self._min_x = min(min(p.x for p in points), drop_point.x - self._rows) - 1
+        max_x = max(max(p.x for p in points), drop_point.x + self._rows) + 1
+        self._width = max_x - self._min_x + 1
+        self._has_floor = has_floor
+        self._drop_point = drop_point
+        self._grid = bytearray(self._width * self._rows)
+
+        for line in lines:
+            if line.p_1.x == line.p_2.x:
+                for y in trace_points(line.p_1.y, line.p_2.y):
+                    self._grid[self._index(line.p_1.x, y)] = self.ROCK
             else:
-                sand += (0, 1)
-
-    return all_sand
+                for x in trace_points(line.p_1.x, line.p_2.x):
+                    self._grid[self._index(x, line.p_1.y)] = self.ROCK
+
+    def _index(self, x: int, y: int) -> int:
+        return y * self._width + x - self._min_x
+
+    def get_sand(self) -> Iterable[Coord2D]:
+        for index, cell in enumerate(self._grid):
+            if cell == self.SAND:
+                y, x = divmod(index, self._width)
+                yield Coord2D(x=x + self._min_x, y=y)
+
+    def pour(self) -> int:
+        """Drops grains until one falls into the abyss or the drop point is clogged,
+        returning the number of grains that came to rest.
+
+        The path of the falling grain is kept as a stack. Every grain follows the
+        same path as the previous one up to the cell where that one settled, so the
+        next grain resumes from the top of the stack instead of the drop point.
+        """
+        grid = self._grid
+        width = self._width
+        last_row = (self._rows - 1) * width
+        drop = self._index(self._drop_point.x, self._drop_point.y)
+
+        if grid[drop]:
+            return 0
+
+        path = [drop]
+        settled = 0
+
+        while path:
+            pos = path[-1]
+
+            if pos < last_row:
+                below = pos + width
+                if not grid[below]:
+                    path.append(below)
+                    continue
+                if not grid[below - 1]:
+                    path.append(below - 1)
+                    continue
+                if not grid[below + 1]:
+                    path.append(below + 1)
+                    continue
+            elif not self._has_floor:
+                break  # Grain is past the lowest rock and will never settle
+
+            grid[pos] = self.SAND
+            settled += 1
+            path.pop()
+
+        return settled
+
+    def fill_triangle(self) -> int:
+        """Counts the grains that settle when there is a floor, in O(cells).
+
+        With a floor, every cell of the triangle under the drop point ends up with
+        sand, unless it is rock or all three cells above it are blocked.
+        """
+        if not self._has_floor:
+            raise ValueError("Triangle fill requires the cave to have a floor")
+
+        grid = self._grid
+        width = self._width
+        drop = self._index(self._drop_point.x, self._drop_point.y)
+        top = self._drop_point.y
+
+        if grid[drop]:
+            return 0
+
+        grid[drop] = self.SAND
+        settled = 1
+
+        for depth in range(1, self._rows - top):
+            row_start = drop + depth * width
+            for pos in range(row_start - depth, row_start + depth + 1):
+                if grid[pos]:
+                    continue
+                above = pos - width
+                if (
+                    grid[above - 1] == self.SAND
+                    or grid[above] == self.SAND
+                    or grid[above + 1] == self.SAND
+                ):
+                    grid[pos] = self.SAND
+                    settled += 1
+
+        return settled
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
     lines = list(parse_input(s))
-    # Find first point of contact
     origin = Coord2D(500, 0)
 
-    sand_part_1 = get_total_sand(drop_point=origin, lines=lines)
-
-    # for part 2 add the line on the bottom
-    max_y = max(max(line.p_1.y, line.p_2.y) for line in lines)
-    floor_y = max_y + 2
-    floor_x = floor_y + 1  # need to create a floor where the base is twice the height
-    bottom_line = Line(
-        p_1=Coord2D(x=origin.x - floor_x, y=floor_y),
-        p_2=Coord2D(x=origin.x + floor_x, y=floor_y),
-    )
-
-    lines_part_2 = [*lines, bottom_line]
-    sand_part_2 = get_total_sand(drop_point=origin, lines=lines_part_2)
-
-    visualize_lines(lines, sand_part_1)
-    visualize_lines(lines_part_2, sand_part_2)
+    sand_part_1 = Cave(lines, drop_point=origin).pour()
+    sand_part_2 = Cave(lines, drop_point=origin, has_floor=True).fill_triangle()
 
-    return len(sand_part_1), len(sand_part_2)
+    return sand_part_1, sand_part_2
 
 
 TEST_INPUT = """\
@@ -232,5 +276,16 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+def test_cave_pour_with_floor_matches_fill_triangle() -> None:
+    lines = list(parse_input(TEST_INPUT))
+    origin = Coord2D(500, 0)
+
+    poured = Cave(lines, drop_point=origin, has_floor=True)
+    filled = Cave(lines, drop_point=origin, has_floor=True)
+
+    assert poured.pour() == filled.fill_triangle() == 93
+    assert set(poured.get_sand()) == set(filled.get_sand())
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
@@ -1,6 +1,4 @@
-from collections import defaultdict
-from heapq import heappop
-from heapq import heappush
+from math import lcm
 from typing import TypeAlias
 
 import pytest
@@ -8,7 +6,7 @@ import pytest
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
 from advent_of_code.exceptions import UnexpectedConditionError
-from advent_of_code.type_defs import Coord2D
+from advent_of_code.grids import Coord2D
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -20,36 +18,39 @@ Element: TypeAlias = str
 
 
 class MapInfo:
+    """Blizzard layout of the valley stored as one integer bitmask per row, where
+    bit `x` represents column `x` (walls excluded).
+
+    Horizontal blizzards never leave their row, so at a given period their mask is
+    the original row mask rotated by `period % width`. Vertical blizzards never
+    leave their column, so the up/down masks for row `y` at a given period are the
+    original masks of row `(y ± period) % height`.
+    """
+
     def __init__(
         self, width: int, height: int, elements: dict[Coord2D, Element]
     ) -> None:
         self._width = width
         self._height = height
         self._elements = elements
+        self._full_mask = (1 << width) - 1
 
-        self._up: dict[int, set[Coord2D]] = defaultdict(set)
-        self._down: dict[int, set[Coord2D]] = defaultdict(set)
-        self._left: dict[int, set[Coord2D]] = defaultdict(set)
-        self._right: dict[int, set[Coord2D]] = defaultdict(set)
+        self._up: list[int] = [0] * height
+        self._down: list[int] = [0] * height
+        self._left: list[int] = [0] * height
+        self._right: list[int] = [0] * height
 
         for (x, y), e in self._elements.items():
+            bit = 1 << x
             match e:
                 case "^":  # Origin is at top left; `y` increases downward
-                    for i in range(self._height):
-                        new_y = (y - i) % self._height
-                        self._up[i].add(Coord2D(x=x, y=new_y))
+                    self._up[y] |= bit
                 case "v":
-                    for i in range(self._height):
-                        new_y = (y + i) % self._height
-                        self._down[i].add(Coord2D(x=x, y=new_y))
+                    self._down[y] |= bit
                 case ">":
-                    for i in range(self._width):
-                        new_x = (x + i) % self._width
-                        self._right[i].add(Coord2D(x=new_x, y=y))
+                    self._right[y] |= bit
                 case "<":
-                    for i in range(self._width):
-                        new_x = (x - i) % self._width
-                        self._left[i].add(Coord2D(x=new_x, y=y))
+                    self._left[y] |= bit
                 case _:
                     raise UnexpectedConditionError(f"Unexpected value of {e}")
 
@@ -61,50 +62,63 @@ class MapInfo:
     def height(self) -> int:
         return self._height
 
+    @property
+    def full_mask(self) -> int:
+        return self._full_mask
+
     def get_indexes(self, period: int) -> tuple[int, int]:
         return period % self._width, period % self._height
 
-    def get_map(self, period: int = 0) -> dict[Coord2D, Element]:
-        horizontal_index, vertical_index = self.get_indexes(period=period)
+    def get_row_mask(self, y: int, period: int) -> int:
+        """Returns the bitmask of the columns occupied by any blizzard in row `y`"""
+        h_idx, v_idx = self.get_indexes(period=period)
+        width = self._width
+        full = self._full_mask
 
-        element_bit_map = {
-            "^": 0b0001,
-            "v": 0b0010,
-            ">": 0b0100,
-            "<": 0b1000,
-        }
+        right = self._right[y]
+        left = self._left[y]
+        right = ((right << h_idx) | (right >> (width - h_idx))) & full
+        left = ((left >> h_idx) | (left << (width - h_idx))) & full
+
+        return (
+            right
+            | left
+            | self._up[(y + v_idx) % self._height]
+            | self._down[(y - v_idx) % self._height]
+        )
+
+    def get_masks(self, period: int) -> list[int]:
+        return [self.get_row_mask(y, period=period) for y in range(self._height)]
+
+    def get_map(self, period: int = 0) -> dict[Coord2D, Element]:
+        h_idx, v_idx = self.get_indexes(period=period)
+        width = self._width
+        full = self._full_mask
 
         result: dict[Coord2D, Element] = {}
 
-        for sym, items, index in (
-            ("^", self._up, vertical_index),
-            ("v", self._down, vertical_index),
-            (">", self._right, horizontal_index),
-            ("<", self._left, horizontal_index),
-        ):
-            for coord in items[index]:
-                if coord in result:  # there is at least 1 item already in this position
-                    existing = result[coord]
-                    current = element_bit_map[sym]
-
-                    if existing in element_bit_map:
-                        result[coord] = f"{(current | element_bit_map[existing]):x}"
-                    else:
-                        result[coord] = f"{(current | int(existing)):x}"
-                else:
-                    result[coord] = sym
+        for y in range(self._height):
+            right = self._right[y]
+            left = self._left[y]
+            masks = (
+                ("^", 0b0001, self._up[(y + v_idx) % self._height]),
+                ("v", 0b0010, self._down[(y - v_idx) % self._height]),
+                (">", 0b0100, ((right << h_idx) | (right >> (width - h_idx))) & full),
+                ("<", 0b1000, ((left >> h_idx) | (left << (width - h_idx))) & full),
+            )
+            for x in range(width):
+                bits = [(sym, flag) for sym, flag, mask in masks if mask >> x & 1]
+                if len(bits) == 1:
+                    result[Coord2D(x=x, y=y)] = bits[0][0]
+                elif bits:
+                    result[Coord2D(x=x, y=y)] = f"{sum(flag for _, flag in bits):x}"
 
         return result
 
     def is_occupied(self, coord: Coord2D, period: int) -> bool:
-        h_idx, v_idx = self.get_indexes(period=period)
-
-        return (
-            coord in self._up[v_idx]
-            or coord in self._down[v_idx]
-            or coord in self._left[h_idx]
-            or coord in self._right[h_idx]
-        )
+        if not 0 <= coord.y < self._height:
+            return False
+        return bool(self.get_row_mask(coord.y, period=period) >> coord.x & 1)
 
 
 def find_shortest_path(
@@ -113,45 +127,55 @@ def find_shortest_path(
     end: Coord2D,
     period: int = 0,
 ) -> int:
-    offsets = [(1, 0), (0, 1), (0, 0), (0, -1), (-1, 0)]
-    found = False
-    pq: list[tuple[int, Coord2D, tuple[int, int]]] = [
-        (period, start, map_info.get_indexes(period=period))
-    ]
-    visited: dict[tuple[Coord2D, tuple[int, int]], int] = {}
-    total_periods = -1
-
-    while not found:
-        period, coord, period_info = heappop(pq)
-        next_period = period + 1
-        next_period_info = map_info.get_indexes(next_period)
-
-        # get next locations
-        for next_coord in [coord + offset for offset in offsets]:
-            if next_coord == end:
-                found = True
-                total_periods = next_period
-                break
-            else:
-                next_x, next_y = next_coord
-                if (
-                    next_x < 0
-                    or next_x >= map_info.width
-                    or next_y < 0
-                    or next_y >= map_info.height
-                ) and (next_coord != start):
-                    continue
-                else:
-                    state = (next_coord, next_period_info)
-                    if state in visited:
-                        continue
-                    elif map_info.is_occupied(coord=next_coord, period=next_period):
-                        continue
-                    else:
-                        visited[state] = next_period
-                        heappush(pq, (next_period, state[0], state[1]))
-
-    return total_periods
+    """Finds the earliest period at which `end` can be reached, leaving `start` at
+    `period`. Both `start` and `end` must be the openings just outside the valley.
+
+    The search keeps every reachable cell for the current period as a bitmask per
+    row, and advances all of them at once: a cell is reachable in the next period if
+    it, or any of its neighbors, is reachable now and no blizzard lands on it.
+
+    Blizzards repeat every `lcm(width, height)` periods, and waiting at `start` is
+    always possible, so the reachable cells one cycle later include the current
+    ones. Once they are the same a cycle apart they will never change again, which
+    means `end` cannot be reached.
+    """
+    height = map_info.height
+    full = map_info.full_mask
+
+    entry_y = 0 if start.y < 0 else height - 1
+    entry_bit = 1 << start.x
+    exit_y = 0 if end.y < 0 else height - 1
+    exit_bit = 1 << end.x
+
+    cycle = lcm(map_info.width, height)
+    first_period = period
+    frontier = [0] * height
+    previous_cycle = None
+
+    while True:
+        if frontier[exit_y] & exit_bit:
+            return period + 1
+
+        if (period - first_period) % cycle == 0:
+            if frontier == previous_cycle:
+                raise UnexpectedConditionError(f"Unable to reach {end} from {start}")
+            previous_cycle = frontier
+
+        period += 1
+        blizzards = map_info.get_masks(period=period)
+
+        next_frontier = [0] * height
+        above = 0
+        for y in range(height):
+            current = frontier[y]
+            below = frontier[y + 1] if y + 1 < height else 0
+            spread = current | (current << 1) | (current >> 1) | above | below
+            next_frontier[y] = spread & full & ~blizzards[y]
+            above = current
+
+        # We can always wait at the start and step in whenever the entry is free
+        next_frontier[entry_y] |= entry_bit & ~blizzards[entry_y]
+        frontier = next_frontier
 
 
 @aoc.solution(year=YEAR, day=DAY)
@@ -195,6 +219,34 @@ TEST_INPUT = """\
 ######.#
 """
 
+# Overlapping blizzards are rendered as the hex `OR` of ^=1, v=2, >=4, <=8
+TEST_MAP_PERIOD_1 = """\
+.>e.<.
+<..<<.
+>5.95.
+>v..^<
+"""
+
+
+def test_map_info_get_map() -> None:
+    lines = TEST_INPUT.splitlines()
+    elements = {
+        Coord2D(x=col - 1, y=row - 1): char
+        for row, line in enumerate(lines)
+        for col, char in enumerate(line)
+        if char in "><^v"
+    }
+    map_info = MapInfo(width=6, height=4, elements=elements)
+
+    assert map_info.get_map(period=0) == elements
+
+    blizzards = map_info.get_map(period=1)
+    rendered = "".join(
+        "".join(blizzards.get(Coord2D(x=x, y=y), ".") for x in range(6)) + "\n"
+        for y in range(4)
+    )
+    assert rendered == TEST_MAP_PERIOD_1
+
 
 @pytest.mark.parametrize(
     ("input_s", "expected"),
@@ -204,5 +256,19 @@ def test_solve(input_s: str, expected: str) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+def test_find_shortest_path_unreachable() -> None:
+    # The blizzards always cover both cells above the exit
+    map_info = MapInfo(
+        width=2,
+        height=2,
+        elements={Coord2D(x=0, y=1): ">", Coord2D(x=1, y=1): ">"},
+    )
+
+    with pytest.raises(UnexpectedConditionError, match="Unable to reach"):
+        find_shortest_path(
+            map_info=map_info, start=Coord2D(x=0, y=-1), end=Coord2D(x=1, y=2)
+        )
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
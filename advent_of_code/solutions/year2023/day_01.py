@@ -1,9 +1,8 @@
-from typing import Sequence
-
 import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
+from advent_of_code.parsers import MultiPatternMatcher
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -28,40 +27,22 @@ STRING_TO_NUM = {
 COMBINED_LOOKUP = {**DIGIT_TO_NUM, **STRING_TO_NUM}  # Used in part 2
 
 
-def find_occurrences(val: str, sub: str) -> Sequence[int]:
-    """
-    Find all occurrences of sub in val.
-
-    :param val: The string to search in.
-    :param sub: The string to search for.
-    :return: A list of indices where sub occurs in val.
-    """
-    return [i for i in range(len(val)) if val.startswith(sub, i)]
-
-
-def get_calibration_value(code: str, lookup: dict[str, int]) -> int:
+def get_calibration_value(code: str, matcher: MultiPatternMatcher[int]) -> int:
     """
     Get the calibration value from the input data. This is done by concatenating the
     first occurrence of a number with the last to produce a 2-digit integer.
 
-    Remarks:
-        This currently is unnecessarily slow. It can be reduced from n * log(n) to n.
-
     :param code: The code to get calibration value from
-    :param lookup: A lookup of string values to their associated integer value
+    :param matcher: A matcher of string values to their associated integer value
     :return: A 2-digit number
     """
+    found = matcher.find_first_last(code)
 
-    nums_with_pos = sorted(
-        (pos, val)
-        for word, val in lookup.items()
-        for pos in find_occurrences(code, word)
-    )
-
-    if not nums_with_pos:
+    if found is None:
         raise ValueError(f"Unexpected code: '{code}'")
 
-    return nums_with_pos[0][1] * 10 + nums_with_pos[-1][1]  # Slow version
+    (_, first), (_, last) = found
+    return first * 10 + last
 
 
 def get_calibration_sum(codes: list[str], lookup: dict[str, int]) -> int:
@@ -72,7 +53,8 @@ def get_calibration_sum(codes: list[str], lookup: dict[str, int]) -> int:
     :param lookup: A lookup of string values to their associated integer value
     :return: The sum of the calibration values
     """
-    return sum(get_calibration_value(code, lookup) for code in codes)
+    matcher = MultiPatternMatcher(lookup)
+    return sum(get_calibration_value(code, matcher) for code in codes)
 
 
 @aoc.solution(year=YEAR, day=DAY)
@@ -112,7 +94,6 @@ zoneight234
 def test_get_calibration_sum(
     input_s: str, lookup: dict[str, int], expected: int
 ) -> None:
-    print()
     assert get_calibration_sum(input_s.splitlines(), lookup) == expected
 
 
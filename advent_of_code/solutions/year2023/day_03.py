@@ -1,9 +1,12 @@
-import operator
+import re
 from collections import defaultdict
-from functools import reduce
-from typing import TypeAlias
+from itertools import chain
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
 
 import pytest
+from more_itertools import triplewise
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
@@ -11,102 +14,107 @@ from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
 
-Coord: TypeAlias = tuple[int, int]
-
-# NumberLocation uniquely identifies a number in the schematic
-#     |<-length->|
-#     123456789101
-#     |
-#   [x,y]: Coord
-
-NumberLocation: TypeAlias = tuple[Coord, int]
-
-
 YEAR = 2023
 DAY = 3
 
-ADJACENT_NODES = (
-    (-1, 1),
-    (0, 1),
-    (1, 1),
-    (-1, 0),
-    (1, 0),
-    (-1, -1),
-    (0, -1),
-    (1, -1),
+NUMBER_RE = re.compile(r"\d+")
+
+# Map every cell to a binary digit, to read the row as a mask in a single call
+SYMBOLS_TABLE = str.maketrans(
+    {chr(c): "0" if chr(c) in "0123456789." else "1" for c in range(128)}
 )
+GEARS_TABLE = str.maketrans({chr(c): "1" if chr(c) == "*" else "0" for c in range(128)})
 
 
-def lft(coord: Coord) -> Coord:
-    return coord[0] - 1, coord[1]
+class SchematicRow(NamedTuple):
+    # (mask of the columns touching the number, value) of every number
+    numbers: list[tuple[int, int]]
+    # Bit `col` is set when there is a symbol, or a gear, at that column
+    symbols: int
+    gears: int
 
 
-def rgt(coord: Coord) -> Coord:
-    return coord[0] + 1, coord[1]
+EMPTY_ROW = SchematicRow(numbers=[], symbols=0, gears=0)
 
 
-def get_number(schematic: dict[Coord, str], coord: Coord) -> tuple[NumberLocation, int]:
-    # Go all the way to the beginning
-    start_coord = coord
+def get_span_mask(start: int, end: int) -> int:
+    """Mask of the columns touching the number in `[start, end)`, diagonals included"""
+    low = max(start - 1, 0)
+    return ((1 << (end + 1)) - 1) ^ ((1 << low) - 1)
 
-    while (left := lft(start_coord)) in schematic and schematic[left].isdigit():
-        start_coord = left
 
-    result_num = 0
-    current = start_coord
-    num_length = 0
+def get_mask(line: str, table: dict[int, str]) -> int:
+    # Column 0 is the lowest bit
+    return int(line[::-1].translate(table) or "0", 2)
 
-    while current in schematic and schematic[current].isdigit():
-        result_num = result_num * 10 + int(schematic[current])
-        num_length += 1
-        current = rgt(current)
 
-    return (start_coord, num_length), result_num
+def parse_row(line: str) -> SchematicRow:
+    return SchematicRow(
+        numbers=[
+            (get_span_mask(*m.span()), int(m.group())) for m in NUMBER_RE.finditer(line)
+        ],
+        symbols=get_mask(line, SYMBOLS_TABLE),
+        gears=get_mask(line, GEARS_TABLE),
+    )
 
 
-@aoc.solution(year=YEAR, day=DAY)
-def solve(s: str) -> Solution:
-    schematic: dict[Coord, str] = {}
-    symbols: list[Coord] = []
+def iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def get_ratio_sum(gears: dict[int, list[int]]) -> int:
+    return sum(
+        numbers[0] * numbers[1] for numbers in gears.values() if len(numbers) == 2
+    )
 
-    for row, line in enumerate(s.splitlines()):
-        for col, char in enumerate(line):
-            if char == ".":  # ignore empty space
-                continue
 
-            current = col, row  # use (x,y)
-            schematic[col, row] = char
+def scan_schematic(lines: Iterable[str]) -> tuple[int, int]:
+    """
+    Returns the sum of the part numbers and the sum of the gear ratios.
 
-            if not char.isdigit():
-                symbols.append(current)
+    Rows are parsed one at a time and only a window of three rows is kept, so a
+    number is only tested against the symbol masks of the rows above, itself and
+    below. The numbers next to the gears of a row are all known once the row below
+    it is scanned, when its gear ratios are added up and dropped.
+    """
+    part_sum, ratio_sum = 0, 0
+    # Numbers next to each gear, by row and then column
+    gear_numbers: dict[int, dict[int, list[int]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
 
-    numbers: dict[NumberLocation, int] = {}
-    visited: set[Coord] = set()
+    rows = (parse_row(line) for line in lines)
+    window = triplewise(chain([EMPTY_ROW], rows, [EMPTY_ROW]))
 
-    gears: dict[Coord, list[int]] = defaultdict(list)
+    for row_idx, (above, current, below) in enumerate(window):
+        symbols = above.symbols | current.symbols | below.symbols
+        gears = above.gears | current.gears | below.gears
 
-    for col, row in symbols:
-        for col_off, row_off in ADJACENT_NODES:
-            adj_node = col + col_off, row + row_off
-            if adj_node not in schematic or adj_node in visited:
+        for span, value in current.numbers:
+            if not symbols & span:
                 continue
-            visited.add(adj_node)
-            if schematic[adj_node].isdigit():
-                num_loc, number = get_number(schematic, adj_node)
-                if num_loc in numbers:
-                    continue
-                numbers[num_loc] = number
-                if schematic[col, row] == "*":
-                    gears[col, row].append(number)
-
-    part_1 = sum(numbers.values())
-    part_2 = sum(
-        reduce(operator.mul, gear_lst)
-        for gear_lst in gears.values()
-        if len(gear_lst) == 2
-    )
+            part_sum += value
+            if not gears & span:
+                continue
+            for offset, row in enumerate((above, current, below), start=-1):
+                for col in iter_bits(row.gears & span):
+                    gear_numbers[row_idx + offset][col].append(value)
+
+        ratio_sum += get_ratio_sum(gear_numbers.pop(row_idx - 1, {}))
+
+    # Gears on the last row
+    for row_gears in gear_numbers.values():
+        ratio_sum += get_ratio_sum(row_gears)
+
+    return part_sum, ratio_sum
+
 
-    return part_1, part_2
+@aoc.solution(year=YEAR, day=DAY)
+def solve(s: str) -> Solution:
+    return scan_schematic(s.splitlines())
 
 
 TEST_INPUT = """\
@@ -131,5 +139,19 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+@pytest.mark.parametrize(
+    ("lines", "expected"),
+    (
+        (["12*3"], (15, 36)),
+        (["1.2", ".*.", "3.4"], (10, 0)),
+        (["5..", "*..", "7.."], (12, 35)),
+        (["..", "8*"], (8, 0)),
+        (["4", "#", "", "9"], (4, 0)),
+    ),
+)
+def test_scan_schematic(lines: list[str], expected: tuple[int, int]) -> None:
+    assert scan_schematic(lines) == expected
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
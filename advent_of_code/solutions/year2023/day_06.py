@@ -1,12 +1,13 @@
-import math
 import re
-from functools import reduce
-from operator import mul
+from math import isqrt
+from math import prod
+from typing import Iterable
 
 import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
+from advent_of_code.intervals import Interval
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -15,27 +16,9 @@ YEAR = 2023
 DAY = 6
 
 
-def quad_solve(a: float, b: float, c: float) -> tuple[float, float]:
+def get_winning_window(max_time: int, current_record: int) -> Interval | None:
     """
-    Solve quadratic equation ax^2 + bx + c = 0. Makes the assumption that all solutions
-    are real.
-
-    :param a: coefficient of x^2
-    :param b: coefficient of x
-    :param c: constant term
-    :return: tuple of solutions to the equation.
-    """
-
-    d = math.sqrt(b * b - 4 * a * c)
-    sol_1 = (-b + d) / (2 * a)
-    sol_2 = (-b - d) / (2 * a)
-
-    return sol_1, sol_2
-
-
-def get_ways_to_break_record(max_time: int, current_record: int) -> int:
-    """
-    Finds all integer ways to beat the current record.
+    Finds the range of integer hold times that beat the current record.
 
     Summary:
 
@@ -63,27 +46,38 @@ def get_ways_to_break_record(max_time: int, current_record: int) -> int:
 
             (-1) * t_a ^ 2 + t_t * t_a - d_m = 0
 
-        All is left, is to find all the integer values bounded by the solutions to the
-        previous quadratic equation.
+        The record is beaten strictly between the roots `(t_t -/+ sqrt(D)) / 2`, where
+        `D = t_t ^ 2 - 4 * d_m`. Using the integer square root, `(t_t - isqrt(D)) // 2`
+        is at most one below the first winning hold time, which is then found by
+        checking the distance exactly. The window is symmetric around `t_t / 2`, so
+        no floating point is involved, whatever the size of the numbers.
 
     :param max_time: The time allowed to race
     :param current_record: The record to beat
-    :return: The total ways that the record can be beaten.
+    :return: The inclusive range of winning hold times, or None if it cannot be beaten
     """
+    discriminant = max_time * max_time - 4 * current_record
+    if discriminant <= 0:
+        return None
 
-    sol = quad_solve(a=-1, b=max_time, c=-current_record)
-    left, right = math.ceil(min(sol)), math.floor(max(sol))
+    first = (max_time - isqrt(discriminant)) // 2
+    while first * (max_time - first) <= current_record:
+        first += 1
+        if 2 * first > max_time:
+            return None
 
-    result = 0
+    return first, max_time - first
 
-    # Check if integer solutions exists, this means the record is matched, not exceeded
-    if int(left * (max_time - left)) == current_record:
-        result -= 1
 
-    if int(right * (max_time - right)) == current_record:
-        result -= 1
+def get_ways_to_break_record(max_time: int, current_record: int) -> int:
+    """Returns the total ways that the record can be beaten"""
+    window = get_winning_window(max_time, current_record)
+    return 0 if window is None else window[1] - window[0] + 1
+
 
-    return result + math.floor(right) - math.ceil(left) + 1
+def get_ways_to_break_records(races: Iterable[tuple[int, int]]) -> list[int]:
+    """Returns the ways to beat the record of every `(time, record)` race"""
+    return [get_ways_to_break_record(time, record) for time, record in races]
 
 
 def parse_nums(s: str) -> list[str]:
@@ -101,9 +95,7 @@ def solve(s: str) -> Solution:
     times_1 = [int(t) for t in times_str]
     distances_1 = [int(d) for d in dists_str]
 
-    part_1 = reduce(
-        mul, (get_ways_to_break_record(t, d) for t, d in zip(times_1, distances_1))
-    )
+    part_1 = prod(get_ways_to_break_records(zip(times_1, distances_1, strict=True)))
 
     time_2 = int("".join(times_str))
     dist_2 = int("".join(dists_str))
@@ -113,6 +105,9 @@ def solve(s: str) -> Solution:
     return part_1, part_2
 
 
+BIG_A = 10**30 + 7
+BIG_B = 3 * 10**30 + 1
+
 TEST_INPUT = """\
 Time:      7  15   30
 Distance:  9  40  200
@@ -127,5 +122,34 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+@pytest.mark.parametrize(
+    ("max_time", "current_record", "expected"),
+    (
+        (7, 9, (2, 5)),
+        (30, 200, (11, 19)),
+        (4, 4, None),
+        (5, 6, None),
+        (5, 5, (2, 3)),
+        # Holding `a` or `b` out of `a + b` travels `a * b`, beyond 2 ** 53
+        (BIG_A + BIG_B, BIG_A * BIG_B - 1, (BIG_A, BIG_B)),
+        (BIG_A + BIG_B, BIG_A * BIG_B, (BIG_A + 1, BIG_B - 1)),
+    ),
+)
+def test_get_winning_window(
+    max_time: int, current_record: int, expected: tuple[int, int] | None
+) -> None:
+    assert get_winning_window(max_time, current_record) == expected
+
+
+def test_get_winning_window_matches_brute_force() -> None:
+    for max_time in range(60):
+        for current_record in range(max_time * max_time // 4 + 2):
+            winning = [
+                t for t in range(max_time + 1) if t * (max_time - t) > current_record
+            ]
+            window = get_winning_window(max_time, current_record)
+            assert window == ((winning[0], winning[-1]) if winning else None)
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
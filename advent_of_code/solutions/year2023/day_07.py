@@ -1,5 +1,6 @@
-from collections import Counter
-from operator import itemgetter
+from types import MappingProxyType
+from typing import Mapping
+from typing import TypeAlias
 
 import pytest
 
@@ -11,144 +12,112 @@ from advent_of_code.utilities import get_input_data
 YEAR = 2023
 DAY = 7
 
-CardRankValues = tuple[int, ...]
-HandSignature = tuple[int, ...]
+RankTable: TypeAlias = Mapping[str, int]
 
-CARDS_RANKS = {rank: val for val, rank in enumerate("23456789TJQKA")}
+# Ranking tables are read only, so solving is re-entrant
+CARDS_RANKS: RankTable = MappingProxyType(
+    {rank: val for val, rank in enumerate("23456789TJQKA")}
+)
+# In part 2 J is a joker with the least relative value
+JOKER = "J"
+JOKER_CARDS_RANKS: RankTable = MappingProxyType(
+    {rank: val for val, rank in enumerate("J23456789TQKA")}
+)
 
-# Map hands to relative value
+# Map hands to relative value, by the sum of the squared count of each unique card
 HAND_VALUES_MAP = {
-    (1, 1, 1, 1, 1): 1,  # High card
-    (2, 1, 1, 1): 2,  # One pair
-    (2, 2, 1): 3,  # Two pairs
-    (3, 1, 1): 4,  # Three of a kind
-    (3, 2): 5,  # Full house
-    (4, 1): 6,  # Four of a kind
-    (5,): 7,  # Five of a kind
-}
-
-# Could probably just add the J wildcard count to the most common
-HAND_IMPROVEMENTS_MAPS = {
-    # 1 Joker
-    (4,): (5,),
-    (3, 1): (4, 1),
-    (2, 2): (3, 2),
-    (2, 1, 1): (3, 1, 1),
-    (1, 1, 1, 1): (2, 1, 1, 1),
-    # 2 Jokers
-    (3,): (5,),
-    (2, 1): (4, 1),
-    (1, 1, 1): (3, 1, 1),
-    # 3 Jokers
-    (2,): (5,),
-    (1, 1): (4, 1),
-    # 4 Jokers
-    (1,): (5,),
-    # 5 Jokers
-    (): (5,),
+    5: 0,  # High card: 1 + 1 + 1 + 1 + 1
+    7: 1,  # One pair: 4 + 1 + 1 + 1
+    9: 2,  # Two pairs: 4 + 4 + 1
+    11: 3,  # Three of a kind: 9 + 1 + 1
+    13: 4,  # Full house: 9 + 4
+    17: 5,  # Four of a kind: 16 + 1
+    25: 6,  # Five of a kind: 25
 }
 
+# Card ranks are below 16, each one fits in one hex digit (4 bits) of the hand key
+CARD_BITS = 4
 
-def rank_values(cards: str) -> CardRankValues:
-    """Convert a hand to its relative rank values"""
-    return tuple(CARDS_RANKS[card] for card in cards)
 
-
-def hand_signature(cards: CardRankValues) -> HandSignature:
+def hand_value(cards: str, joker: str | None = None) -> int:
     """
-    Convert a set to its signature, which is a descending ordered tuple of counts of
-    each unique card in the set of cards.
-
-    Since only cardinality of each unique symbol matters, we can uniquely identify each
-    hand by the count of each unique item in a set of cards.
+    Gets the relative value of the type of hand.
 
-    E.g.
-        '11223' == 'TTJJQ' since both have signatures of: 2,2,1 (2 pairs)
+    Adding up the count of each card in the hand gives the sum of the squared counts
+    of each unique card, which is different for every type of hand. Jokers are
+    added to the most common card, which always makes the best hand.
     """
-    return tuple(sorted(Counter(cards).values(), reverse=True))
+    if joker is None or joker not in cards:
+        return HAND_VALUES_MAP[sum(map(cards.count, cards))]
 
+    rest = cards.replace(joker, "")
+    jokers = len(cards) - len(rest)
+    counts = list(map(rest.count, rest))
+    most_common = max(counts, default=0)
+    squares = sum(counts) - most_common * most_common + (most_common + jokers) ** 2
 
-def improve_hand_1(cards: CardRankValues, wildcard: int) -> HandSignature:
-    new_signature = hand_signature(
-        # Filter out wildcards
-        tuple(val for val in cards if val != wildcard)
-    )
+    return HAND_VALUES_MAP[squares]
 
-    return (
-        new_signature
-        if sum(new_signature) == 5
-        else HAND_IMPROVEMENTS_MAPS[new_signature]
-    )
 
+def get_digits_table(ranks: RankTable) -> dict[int, str]:
+    """Translation table from each card to the hex digit of its rank"""
+    return str.maketrans({card: f"{rank:x}" for card, rank in ranks.items()})
 
-def improve_hand_2(cards: CardRankValues, wildcard: int) -> HandSignature:
-    new_signature = hand_signature(
-        # Filter out Joker wildcards
-        tuple(val for val in cards if val != wildcard)
-    )
-    total_wildcards = len(cards) - sum(new_signature)
 
-    if total_wildcards == 0:
-        # nothing to improve
-        return new_signature
-    if total_wildcards == 5:
-        return (5,)
+def get_hand_key(cards: str, digits: dict[int, str], joker: str | None = None) -> int:
+    """
+    Packs the hand value and the rank of each card, in order, into one int.
 
-    first, *rest = new_signature
-    # To improve just add count of wildcards to most common card
-    return first + total_wildcards, *rest
+    :param digits: translation table from `get_digits_table`
+    """
+    card_ranks = int(cards.translate(digits), 16)
+    return (hand_value(cards, joker) << (CARD_BITS * len(cards))) | card_ranks
 
 
-def hand_value(cards: CardRankValues, wildcard: int | None = None) -> int:
-    signature = (
-        improve_hand_2(cards, wildcard)
-        if wildcard is not None
-        else hand_signature(cards)
-    )
-    return HAND_VALUES_MAP[signature]
+def rank_hands(
+    hands: list[str], ranks: RankTable, joker: str | None = None
+) -> list[int]:
+    """
+    Ranks all hands at once.
 
+    The index of each hand is packed in the lowest bits of its key, so a single sort
+    over ints gives the hands in order.
 
-@aoc.solution(year=YEAR, day=DAY)
-def solve(s: str) -> Solution:
-    card_bids = {
-        parts[0]: int(parts[1])
-        for line in s.splitlines()
-        if (parts := line.split(maxsplit=1))
-    }
-
-    total_hands = len(card_bids)
-
-    # Part 1
-    hands_1 = [
-        (cards, (hand_value(hrv), *hrv))
-        for cards in card_bids.keys()
-        if (hrv := rank_values(cards))
+    :return: the indices of `hands`, from the weakest to the strongest hand
+    """
+    digits = get_digits_table(ranks)
+    index_bits = len(hands).bit_length()
+    mask = (1 << index_bits) - 1
+
+    keys = [
+        (get_hand_key(cards, digits, joker) << index_bits) | idx
+        for idx, cards in enumerate(hands)
     ]
-    hands_1.sort(key=itemgetter(1), reverse=True)
+    keys.sort()
 
-    part_1 = sum(
-        (total_hands - idx) * card_bids[cards]
-        for (idx, (cards, _)) in enumerate(hands_1)
-    )
+    return [key & mask for key in keys]
 
-    # Part 2
 
-    # In Part2 J has the least relative value, let's patch it
-    NEW_WILDCARD_VALUE = -1
-    CARDS_RANKS["J"] = NEW_WILDCARD_VALUE
+def get_total_winnings(
+    hands: list[str], bids: list[int], ranks: RankTable, joker: str | None = None
+) -> int:
+    return sum(
+        rank * bids[idx]
+        for rank, idx in enumerate(rank_hands(hands, ranks, joker), start=1)
+    )
 
-    hands_2 = [
-        (cards, (hand_value(hrv, wildcard=NEW_WILDCARD_VALUE), *hrv))
-        for cards in card_bids.keys()
-        if (hrv := rank_values(cards))
-    ]
 
-    hands_2.sort(key=itemgetter(1), reverse=True)
+@aoc.solution(year=YEAR, day=DAY)
+def solve(s: str) -> Solution:
+    hands: list[str] = []
+    bids: list[int] = []
+    for line in s.splitlines():
+        cards, bid = line.split(maxsplit=1)
+        hands.append(cards)
+        bids.append(int(bid))
 
-    part_2 = sum(
-        (total_hands - idx) * card_bids[cards]
-        for (idx, (cards, _)) in enumerate(hands_2)
-    )
+    part_1 = get_total_winnings(hands, bids, CARDS_RANKS)
+    part_2 = get_total_winnings(hands, bids, JOKER_CARDS_RANKS, joker=JOKER)
 
     return part_1, part_2
 
@@ -168,6 +137,29 @@ QQQJA 483
 )
 def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
+    # Solving again gives the same result, nothing is left modified
+    assert solve(input_s).as_tuple() == expected
+
+
+@pytest.mark.parametrize(
+    ("cards", "joker", "expected"),
+    (
+        ("23456", None, 0),
+        ("A23A4", None, 1),
+        ("23432", None, 2),
+        ("TTT98", None, 3),
+        ("23332", None, 4),
+        ("AA8AA", None, 5),
+        ("AAAAA", None, 6),
+        ("QJJQ2", None, 2),
+        ("QJJQ2", "J", 5),
+        ("JJJJJ", "J", 6),
+        ("2345J", "J", 1),
+        ("T55J5", "J", 5),
+    ),
+)
+def test_hand_value(cards: str, joker: str | None, expected: int) -> None:
+    assert hand_value(cards, joker) == expected
 
 
 if __name__ == "__main__":
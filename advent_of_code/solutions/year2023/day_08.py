@@ -1,8 +1,10 @@
-import math
 import re
+from itertools import product
+from typing import NamedTuple
 
 import pytest
 
+from advent_of_code.algorithms.crt import solve_congruences
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
 from advent_of_code.type_defs import Solution
@@ -23,44 +25,135 @@ def parse_input(s: str) -> tuple[list[str], dict[str, tuple[str, str]]]:
     return [c for c in commands], network
 
 
-def get_steps(
-    commands: list[str],
-    network: dict[str, tuple[str, str]],
-    start_node: str,
-    end_nodes: set[str],
-) -> int:
-    steps = 0
-    current = start_node
-
-    while True:
-        for command in commands:
-            if command == "L":
-                current = network[current][0]
-            else:  # command == "R"
-                current = network[current][1]
-            steps += 1
-        if current in end_nodes:
-            break
-
-    return steps
+class GhostWalk(NamedTuple):
+    """
+    The steps at which a walk is on an end node.
+
+    The walk is eventually periodic: `tail_hits` happen only once, while each step in
+    `cycle_hits` repeats every `period` steps, starting at `cycle_start`.
+    """
+
+    tail_hits: list[int]
+    cycle_start: int
+    period: int
+    cycle_hits: list[int]
+
+    def is_hit(self, step: int) -> bool:
+        if step < self.cycle_start:
+            return step in self.tail_hits
+        return any((step - hit) % self.period == 0 for hit in self.cycle_hits)
+
+
+class Network:
+    """
+    Network compiled to integer node ids, walked a whole command sequence at a time.
+
+    Once the commands run out they start over, so the node at the start of a
+    sequence is all that is needed to know the rest of the walk.
+    """
+
+    def __init__(
+        self, commands: list[str], network: dict[str, tuple[str, str]]
+    ) -> None:
+        self.names = list(network)
+        self.ids = {name: node for node, name in enumerate(self.names)}
+        self.commands = commands
+        self._left = [self.ids[left] for left, _ in network.values()]
+        self._right = [self.ids[right] for _, right in network.values()]
+
+    def get_jump_table(self, end_nodes: set[int]) -> tuple[list[int], list[list[int]]]:
+        """
+        Walks the whole command sequence once from every node.
+
+        :returns: the node reached at the end of the sequence, and the steps within
+            the sequence that land on an end node, for each starting node
+        """
+        moves = [self._left if c == "L" else self._right for c in self.commands]
+        jumps = []
+        end_offsets = []
+
+        for node in range(len(self.names)):
+            offsets = []
+            for step, move in enumerate(moves, start=1):
+                node = move[node]
+                if node in end_nodes:
+                    offsets.append(step)
+            jumps.append(node)
+            end_offsets.append(offsets)
+
+        return jumps, end_offsets
+
+    def get_walks(self, starts: list[str], ends: list[str]) -> list[GhostWalk]:
+        """Finds the structure of the walk from each start, until it loops"""
+        jumps, end_offsets = self.get_jump_table({self.ids[name] for name in ends})
+        length = len(self.commands)
+        result = []
+
+        for start in starts:
+            node = self.ids[start]
+            seen: dict[int, int] = {}
+            hits: list[int] = []
+            while node not in seen:
+                seen[node] = len(seen)
+                hits.extend(
+                    seen[node] * length + offset for offset in end_offsets[node]
+                )
+                node = jumps[node]
+
+            cycle_start = seen[node] * length + 1
+            result.append(
+                GhostWalk(
+                    tail_hits=[hit for hit in hits if hit < cycle_start],
+                    cycle_start=cycle_start,
+                    period=(len(seen) - seen[node]) * length,
+                    cycle_hits=[hit for hit in hits if hit >= cycle_start],
+                )
+            )
+
+        return result
+
+
+def get_first_common_step(walks: list[GhostWalk]) -> int:
+    """
+    Finds the first step where all the walks are on an end node at the same time.
+
+    Steps before every walk is in its cycle are checked one by one, as they are
+    limited to the tail hits of the walk that loops last. Past that point each walk
+    is a set of congruences, so they are combined by the Chinese remainder theorem.
+    """
+    if not walks:
+        raise ValueError("No walks to follow")
+
+    latest = max(walks, key=lambda w: w.cycle_start)
+    for step in latest.tail_hits:
+        if all(walk.is_hit(step) for walk in walks):
+            return step
+
+    # One set of congruences for each choice of a cycle hit per walk, usually one
+    periods = [walk.period for walk in walks]
+    solutions = [
+        solution
+        for hits in product(*(walk.cycle_hits for walk in walks))
+        if (solution := solve_congruences(zip(hits, periods, strict=True)))
+    ]
+
+    if not solutions:
+        raise ValueError("The walks are never on end nodes at the same time")
+
+    first = latest.cycle_start
+    return min(first + (residue - first) % modulus for residue, modulus in solutions)
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    commands, network = parse_input(s)
-
-    steps_1 = get_steps(commands, network, "AAA", {"ZZZ"})
+    commands, network_data = parse_input(s)
+    network = Network(commands, network_data)
 
-    ghost_start_nodes = {node: 0 for node in network.keys() if node.endswith("A")}
-    ghost_end_nodes: set[str] = set(
-        node for node in network.keys() if node.endswith("Z")
-    )
+    steps_1 = get_first_common_step(network.get_walks(["AAA"], ["ZZZ"]))
 
-    for start_node in ghost_start_nodes:
-        steps = get_steps(commands, network, start_node, ghost_end_nodes)
-        ghost_start_nodes[start_node] = steps
-
-    steps_2 = math.lcm(*ghost_start_nodes.values())
+    ghost_starts = [node for node in network.names if node.endswith("A")]
+    ghost_ends = [node for node in network.names if node.endswith("Z")]
+    steps_2 = get_first_common_step(network.get_walks(ghost_starts, ghost_ends))
 
     return steps_1, steps_2
 
@@ -111,5 +204,42 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+TEST_INPUT_TAILS = """\
+L
+
+11A = (11B, 11B)
+11B = (11Z, 11Z)
+11Z = (11B, 11B)
+22A = (22Z, 22Z)
+22Z = (22B, 22B)
+22B = (22C, 22C)
+22C = (22Z, 22Z)
+"""
+
+
+@pytest.mark.parametrize(
+    ("input_s", "expected"),
+    (
+        (TEST_INPUT_PART_2, 6),
+        # First hits are 2 and 1, but the walks meet at 4, not at lcm(2, 1)
+        (TEST_INPUT_TAILS, 4),
+    ),
+)
+def test_get_first_common_step(input_s: str, expected: int) -> None:
+    network = Network(*parse_input(input_s))
+    starts = [node for node in network.names if node.endswith("A")]
+    ends = [node for node in network.names if node.endswith("Z")]
+
+    assert get_first_common_step(network.get_walks(starts, ends)) == expected
+
+
+def test_get_walks() -> None:
+    network = Network(*parse_input(TEST_INPUT_TAILS))
+
+    assert network.get_walks(["22A"], ["22Z"]) == [
+        GhostWalk(tail_hits=[1], cycle_start=2, period=3, cycle_hits=[4])
+    ]
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
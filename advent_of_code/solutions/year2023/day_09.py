@@ -1,8 +1,11 @@
+from collections import defaultdict
+from math import comb
+
+import numpy as np
 import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
-from advent_of_code.exceptions import SolutionNotImplementedError
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -10,25 +13,76 @@ from advent_of_code.utilities import get_input_data
 YEAR = 2023
 DAY = 9
 
+INT64_LIMIT = 2**63
+
+
+def get_weights(length: int) -> np.ndarray:
+    """
+    Returns the weights that extrapolate a history of `length` values.
+
+    A history with all-zero differences at depth `length` is a polynomial of degree
+    below `length`, so the extrapolated values are a fixed combination of the
+    history (Newton forward differences in closed form):
+
+        next     = sum((-1) ** (length - 1 - i) * comb(length, i) * h[i])
+        previous = sum((-1) ** i * comb(length, i + 1) * h[i])
+
+    :return: array of shape `(length, 2)`, with the next and previous value columns
+    """
+    weights = [
+        ((-1) ** (length - 1 - i) * comb(length, i), (-1) ** i * comb(length, i + 1))
+        for i in range(length)
+    ]
+    # Python ints once the binomials go beyond int64
+    dtype = np.int64 if comb(length, length // 2) < INT64_LIMIT else object
+    return np.array(weights, dtype=dtype).reshape(length, 2)
 
-def differentiate(nums: list[int]) -> list[int]:
-    return [nums[i] - nums[i - 1] for i in range(1, len(nums))]
 
+def extrapolate(histories: np.ndarray) -> np.ndarray:
+    """
+    Extrapolates every history, given as the rows of a 2D array.
 
-def parse_input(s: str) -> list[list[int]]:
+    :return: array of shape `(len(histories), 2)` with the next and previous values,
+        with Python ints whenever int64 could overflow, even once summed up
+    """
+    rows, length = histories.shape
+    weights = get_weights(length)
+    # Each value is bounded by the largest input times the sum of the weights,
+    # `2 ** length`, and the sum of all of them by that times the number of rows
+    largest = int(np.abs(histories).max(initial=0))
+    if weights.dtype == object or (largest * rows) << length >= INT64_LIMIT:
+        return histories.astype(object) @ weights.astype(object)
+    return histories @ weights
+
+
+def parse_input(s: str) -> list[np.ndarray]:
+    """Groups the histories by length, as a 2D array per length"""
+    by_length: dict[int, list[str]] = defaultdict(list)
     for line in s.splitlines():
-        yield [int(n) for n in line.split()]
+        values = line.split()
+        by_length[len(values)].extend(values)
+
+    result = []
+    for length, values in by_length.items():
+        try:
+            histories = np.array(values, dtype=np.int64)
+        except OverflowError:
+            histories = np.array([int(v) for v in values], dtype=object)
+        result.append(histories.reshape(-1, length))
+
+    return result
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    for nums in parse_input(s):
-        diff_list = []
-        diff = differentiate(nums)
-        if any(diff):
-            diff_list.append(diff[-1])
-        else:
-            break
+    part_1, part_2 = 0, 0
+
+    for histories in parse_input(s):
+        next_values, previous_values = extrapolate(histories).sum(axis=0)
+        part_1 += int(next_values)
+        part_2 += int(previous_values)
+
+    return part_1, part_2
 
 
 TEST_INPUT = """\
@@ -40,11 +94,33 @@ TEST_INPUT = """\
 
 @pytest.mark.parametrize(
     ("input_s", "expected"),
-    ((TEST_INPUT, ()),),
+    ((TEST_INPUT, (114, 2)),),
 )
 def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+@pytest.mark.parametrize("length", (1, 2, 5, 21, 70))
+def test_extrapolate_polynomial(length: int) -> None:
+    def poly(x: int) -> int:
+        return 3 * x**3 - 7 * x**2 + x - 11
+
+    histories = np.array([[poly(x) for x in range(length)]], dtype=np.int64)
+
+    [[next_value, previous_value]] = extrapolate(histories)
+
+    if length > 3:
+        assert (next_value, previous_value) == (poly(length), poly(-1))
+    assert next_value == sum(get_weights(length)[:, 0] * histories[0].astype(object))
+
+
+def test_solve_large_values() -> None:
+    assert solve(f"{2**70} {2**71} {3 * 2**70}").as_tuple() == (2**72, 0)
+
+
+def test_solve_mixed_lengths() -> None:
+    assert solve("1 2 3\n5 5 5 5\n2 4 8 16 32").as_tuple() == (4 + 5 + 62, 0 + 5 + 2)
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
@@ -1,5 +1,4 @@
 from enum import Enum
-from itertools import pairwise
 from typing import get_args
 
 import pytest
@@ -10,6 +9,7 @@ from typing_extensions import NamedTuple
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
+from advent_of_code.polygons import get_interior_points
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -147,59 +147,6 @@ def trace_path(tiles: dict[Coord, Tile]) -> list[Coord]:
     return result
 
 
-def get_path_area(path: list[Coord]) -> tuple[set[Coord], set[Coord]]:
-    """
-    Returns the area contained by the path.
-
-    This is done by traversing the path and filling areas to the right, and to the left.
-
-    Remarks:
-        The path is assumed to be closed.
-    """
-
-    min_x, min_y = -10, -10
-    max_x, max_y = max(c[0] for c in path) + 10, max(c[1] for c in path) + 10
-
-    path_set = set(path)
-    right_area: set[Coord] = set()
-    left_area: set[Coord] = set()
-
-    def fill(coord: Coord, area: set[Coord]) -> None:
-        q = [coord]
-
-        while q:
-            curr = q.pop()
-            if curr in path_set or curr in area:  # Is in direct path
-                continue
-            elif curr.y <= min_y or curr.y > max_y or curr.x <= min_x or curr.x > max_x:
-                # Out of bounds, ignore it.
-                continue
-            else:
-                area.add(curr)
-                for side in Side:
-                    q.append(curr + side.value)
-
-    PATH_DIRECTION_TO_SIDES: dict[Coord, tuple[Coord, Coord]] = {
-        Coord(1, 0): (Coord(0, -1), Coord(0, 1)),
-        Coord(-1, 0): (Coord(0, 1), Coord(0, -1)),
-        Coord(0, 1): (Coord(1, 0), Coord(-1, 0)),
-        Coord(0, -1): (Coord(-1, 0), Coord(1, 0)),
-    }
-
-    for from_tile, to_tile in pairwise(path):
-        diff = to_tile - from_tile
-        left_off, right_off = PATH_DIRECTION_TO_SIDES[diff]
-        left, right = from_tile + left_off, from_tile + right_off
-
-        fill(left, left_area)
-        fill(right, right_area)
-
-    print(f"left: {len(left_area)}")
-    print(f"right: {len(right_area)}")
-
-    return left_area, right_area
-
-
 def visualize(
     start: tuple[int, int],
     path: list[tuple[int, int]],
@@ -232,27 +179,13 @@ def visualize(
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    """
-    Notes:
-        - There is a bug in this solution, there can be corner pipes (J,L,F,7) that are
-          not trying to fill to the perpendicular directions of the path. By visualizing
-          the fill, there are unfilled 1x1 areas.
-        - We should be able to determine what area is "inside" the path vs. "outside" by
-          counting turns. Right now we make the *GROSS* assumption that the smallest set
-          belongs to the inside.
-    """
-
-    # TODO: fix this solution
     tiles = parse_map(s)
     path = trace_path(tiles)
 
     part_1 = len(path) // 2
 
-    left_area, right_area = get_path_area(path)
-
-    # visualize(path[0], path, left_area, right_area)
-
-    part_2 = min(len(left_area), len(right_area))
+    # Every tile of the loop is a vertex of the polygon it encloses
+    part_2 = get_interior_points(path)
 
     return part_1, part_2
 
@@ -323,7 +256,6 @@ L7JLJL-JLJLJL--JLJ.L
     ),
 )
 def test_solve(input_s: str, expected: tuple[()]) -> None:
-    print()
     assert solve(input_s).as_tuple() == expected
 
 
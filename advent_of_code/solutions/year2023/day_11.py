@@ -1,3 +1,5 @@
+from typing import Iterable
+
 import pytest
 
 from advent_of_code.core import aoc
@@ -24,66 +26,47 @@ def parse_input(s: str) -> dict[Coord, int]:
     return result
 
 
-def expand_universe(
-    universe: dict[Coord, int], expansion_factor: int = 2
-) -> dict[Coord, int]:
-    """
-    Creates an expanded universe based on the inputs. The universe gets expanded by
-    expanding empty columns and rows by the provided factor.
+def get_pair_sum(values: list[int]) -> int:
+    """Sum of the differences between every pair of sorted values.
 
-    :param universe: The universe to expand, a map of coordinates to galaxy id.
-    :param expansion_factor: The factor by which to expand the universe.
-    :return: An expanded universe.
+    Each value is subtracted from the `i` values after it and has the `i` values
+    before it subtracted from it, which replaces the prefix sum of the values
+    before each one.
     """
-    # find columns w/o universes
-    max_col = max(c[0] for c in universe)
-    max_row = max(c[1] for c in universe)
-
-    empty_cols = set(c for c in range(max_col + 1)) - set(c[0] for c in universe)
-    empty_rows = set(r for r in range(max_row + 1)) - set(c[1] for c in universe)
-
-    # create map all empty rows above, and all empty cols left
-    expanded_cols_left = [0] * (max_col + 1)
-    expanded_rows_above = [0] * (max_row + 1)
-
-    # We could also just store the empty column/row positions with the expansion factor
-    # and iterate the galaxies in order to calculate new locations.
-    expanded_cols_seen = 0
-    for idx in range(max_col + 1):
-        expanded_cols_left[idx] = expanded_cols_seen
-        if idx in empty_cols:
-            expanded_cols_seen += expansion_factor - 1
+    n = len(values)
+    return sum(v * (2 * i - n + 1) for i, v in enumerate(values))
 
-    expanded_rows_seen = 0
-    for idx in range(max_row + 1):
-        expanded_rows_above[idx] = expanded_rows_seen
-        if idx in empty_rows:
-            expanded_rows_seen += expansion_factor - 1
 
-    expanded = {}
-    for (col, row), idx in universe.items():
-        new_col, new_row = col + expanded_cols_left[col], row + expanded_rows_above[row]
-        expanded[new_col, new_row] = idx
-
-    return expanded
+def get_distance_sums(universe: dict[Coord, int], factors: Iterable[int]) -> list[int]:
+    """
+    Gets the sum of the distances between each galaxy pair, for each expansion factor.
 
+    Expanding the universe moves a galaxy by `factor - 1` for each empty row or column
+    before it, so along each axis the sum of distances is the sum for the unexpanded
+    coordinates, plus `factor - 1` times the sum for the number of empty lines
+    before each galaxy. Both sums only need the sorted coordinates, so every factor
+    is answered without building an expanded universe.
 
-def get_distances(universe: dict[Coord, int]) -> dict[tuple[int, int], int]:
-    """Gets the distance between of each galaxy pair"""
-    result = {}
-    for (col, row), gal in universe.items():
-        for (other_col, other_row), other_gal in universe.items():
-            if gal == other_gal:
-                continue
+    :param universe: The universe, a map of coordinates to galaxy id.
+    :param factors: The factors by which empty rows and columns get expanded.
+    :return: The sum of all distances for each of the factors.
+    """
+    distance_sum = 0
+    empty_sum = 0
 
-            stable_id = min(gal, other_gal), max(gal, other_gal)
-            if stable_id in result:
-                continue
+    for axis in (0, 1):
+        values = sorted(c[axis] for c in universe)
+        empty_before = []
+        occupied = 0
+        for idx, v in enumerate(values):
+            if idx == 0 or v != values[idx - 1]:
+                occupied += 1
+            empty_before.append(v - occupied + 1)
 
-            distance = abs(col - other_col) + abs(row - other_row)
-            result[stable_id] = distance
+        distance_sum += get_pair_sum(values)
+        empty_sum += get_pair_sum(empty_before)
 
-    return result
+    return [distance_sum + (factor - 1) * empty_sum for factor in factors]
 
 
 def draw_universe(universe: dict[Coord, int]) -> None:
@@ -102,12 +85,7 @@ def draw_universe(universe: dict[Coord, int]) -> None:
 def solve(s: str) -> Solution:
     universe = parse_input(s)
     # draw_universe(universe)
-    expanded_1 = expand_universe(universe)
-    # draw_universe(expanded_1)
-    expanded_2 = expand_universe(universe, expansion_factor=1000000)
-
-    part_1 = sum(get_distances(expanded_1).values())
-    part_2 = sum(get_distances(expanded_2).values())
+    part_1, part_2 = get_distance_sums(universe, factors=(2, 1000000))
 
     return part_1, part_2
 
@@ -131,7 +109,6 @@ TEST_INPUT = """\
     ((TEST_INPUT, (374, 82000210)),),
 )
 def test_solve(input_s: str, expected: tuple[()]) -> None:
-    print()
     assert solve(input_s).as_tuple() == expected
 
 
@@ -142,10 +119,9 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
         (TEST_INPUT, 100, 8410),
     ),
 )
-def test_get_distances(input_s: str, factor: int, expected: int) -> None:
+def test_get_distance_sums(input_s: str, factor: int, expected: int) -> None:
     universe = parse_input(input_s)
-    expanded = expand_universe(universe, factor)
-    sum_of_distances = sum(get_distances(expanded).values())
+    [sum_of_distances] = get_distance_sums(universe, factors=[factor])
     assert sum_of_distances == expected
 
 
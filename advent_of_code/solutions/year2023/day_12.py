@@ -1,4 +1,5 @@
-from functools import cache
+import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Iterable
 
 import pytest
@@ -11,48 +12,67 @@ from advent_of_code.utilities import get_input_data
 YEAR = 2023
 DAY = 12
 
+DOTS_RE = re.compile(r"\.+")
 
-def find_arrangements(record: str, config: list[int]) -> int:  # noqa: C90
-    @cache
-    def rec(ri: int, ci: int) -> int:
-        if ci == len(config):
-            # No more groups to match
-            if "#" in record[ri:]:
-                return 0
-            else:
-                # All that is left, is either "." or a "?" acting as "."
-                return 1
-        else:
-            while ri < len(record) and record[ri] == ".":  # Find next start
-                ri += 1
-            if ri >= len(record):
-                return 0
-            if ri > 0 and record[ri - 1] == "#":
-                # We have to be at the beginning or have space ("?"|".") before current
-                # group
-                return 0
-            result = 0
-
-            if record[ri] == "?":
-                # Take ? as "." and find arrangements w/o choosing current pos as #
-                result += rec(ri + 1, ci)
-
-            group_size = config[ci]
-            curr_group = record[ri : ri + group_size]
-            if len(curr_group) < group_size:
-                return result
-            if "." in curr_group:
-                # Can't have empty spaces in group
-                return result
-            if record[ri + group_size : ri + group_size + 1] == "#":
-                # Can't have # right next to current group
-                return result
-
-            result += rec(ri + group_size + 1, ci + 1)
-
-            return result
-
-    return rec(0, 0)
+# Below this many records, starting worker processes costs more than it saves
+PARALLEL_MIN_RECORDS = 5000
+
+
+def find_arrangements(record: str, config: list[int]) -> int:
+    """Counts the ways of placing the groups in `config` over the unknowns in `record`.
+
+    `ways[i]` holds the number of arrangements of the groups placed so far within
+    `record[i:]`. Groups are added from last to first, so each table only depends
+    on the previous one. A group can start at `i` when there is no "." before
+    `next_dot[i]` and it is not followed by a "#", so every transition is O(1).
+    Only the starts that leave room for the groups on either side are visited.
+    """
+    record = DOTS_RE.sub(".", record).strip(".")
+    n = len(record)
+
+    # First "." at or after each position
+    next_dot = [n] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        next_dot[i] = i if record[i] == "." else next_dot[i + 1]
+    # A group ending at `end` must be followed by the end of record or a non "#"
+    no_hash_after = [c != "#" for c in record] + [True]
+
+    # With no groups left, the rest of the record cannot have any "#"
+    last_hash = record.rfind("#")
+    ways = [0] * (last_hash + 1) + [1] * (n + 1 - last_hash)
+
+    needed = sum(config) + len(config) - 1
+    earliest = needed + 1
+    for size in reversed(config):
+        earliest -= size + 1
+        latest = n - needed + earliest
+        new_ways = [0] * (n + 2)
+        for i in range(latest, earliest - 1, -1):
+            count = new_ways[i + 1] if record[i] != "#" else 0
+            end = i + size
+            if next_dot[i] >= end and no_hash_after[end]:
+                count += ways[end + 1]
+            new_ways[i] = count
+        ways = new_ways
+
+    return ways[0]
+
+
+def count_arrangements(
+    items: list[tuple[str, list[int]]], unfold: int = 1, workers: int | None = None
+) -> int:
+    """Total arrangements of all records, each repeated `unfold` times.
+
+    Large batches are spread over a process pool.
+    """
+    records = ["?".join([record] * unfold) for record, _ in items]
+    configs = [config * unfold for _, config in items]
+
+    if workers == 1 or len(records) < PARALLEL_MIN_RECORDS:
+        return sum(map(find_arrangements, records, configs))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(find_arrangements, records, configs, chunksize=1000))
 
 
 def parse_input(s: str) -> Iterable[tuple[str, list[int]]]:
@@ -65,11 +85,8 @@ def parse_input(s: str) -> Iterable[tuple[str, list[int]]]:
 def solve(s: str) -> Solution:
     items = list(parse_input(s))
 
-    part_1 = sum(find_arrangements(record, config) for (record, config) in items)
-    part_2 = sum(
-        find_arrangements("?".join([record] * 5), config * 5)
-        for (record, config) in items
-    )
+    part_1 = count_arrangements(items)
+    part_2 = count_arrangements(items, unfold=5)
 
     return part_1, part_2
 
@@ -118,5 +135,13 @@ def test_find_arrangements(record: str, config: list[int], expected: int) -> Non
     assert actual == expected
 
 
+def test_count_arrangements_in_process_pool() -> None:
+    items = list(parse_input(TEST_INPUT)) * (PARALLEL_MIN_RECORDS // 6 + 1)
+
+    assert count_arrangements(items, unfold=2, workers=2) == count_arrangements(
+        items, unfold=2, workers=1
+    )
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
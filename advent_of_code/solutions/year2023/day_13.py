@@ -2,7 +2,6 @@ import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
-from advent_of_code.exceptions import SolutionNotImplementedError
 from advent_of_code.screen import Screen
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
@@ -59,24 +58,37 @@ def get_rows_signature(pattern: list[list[int]]) -> list[int]:
     return result
 
 
-def find_reflection(signature: list[int]) -> tuple[int, int]:
-    max_reflected = -1
-    best_index = -1
+def get_split_differences(signature: list[int], limit: int) -> list[int]:
+    """
+    Counts the differing bits between the rows (or columns) mirrored by each split.
 
-    for idx in range(1, len(signature)):
-        # get right and left
-        right = idx
-        left = idx - 1
-        count = 0
-        while True:
-            if right >= len(signature) or left < 0:
-                return idx, 10
-            if signature[right] != signature[left]:
+    `result[i]` is for a mirror between items `i` and `i + 1`. The XOR popcount of
+    each mirrored pair is accumulated outwards from the split, stopping once it goes
+    over `limit`, as those splits can no longer be a reflection.
+    """
+    total = len(signature)
+    result = []
+
+    for idx in range(1, total):
+        differences = 0
+        for left, right in zip(range(idx - 1, -1, -1), range(idx, total), strict=False):
+            differences += (signature[left] ^ signature[right]).bit_count()
+            if differences > limit:
                 break
-            count += 1
-            right += 1
-            left -= 1
-    return best_index, max_reflected
+        result.append(differences)
+
+    return result
+
+
+def find_reflections(differences: list[int], smudges: int = 0) -> list[int]:
+    """
+    Finds every mirror where exactly `smudges` bits differ from a perfect reflection.
+
+    :param differences: differences of each split, from `get_split_differences`
+        with a `limit` of at least `smudges`
+    :return: the number of items before each such mirror
+    """
+    return [idx for idx, d in enumerate(differences, start=1) if d == smudges]
 
 
 def print_pattern(pattern: list[list[int]]) -> None:
@@ -100,40 +112,22 @@ def print_pattern(pattern: list[list[int]]) -> None:
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    patterns = parse_input(s)
-
-    best_indexes = []
+    part_1, part_2 = 0, 0
 
-    for pattern in patterns:
-        col_signature = get_columns_signature(pattern)
-        row_signature = get_rows_signature(pattern)
+    for pattern in parse_input(s):
+        # Differences beyond a single smudge are never needed
+        row_differences = get_split_differences(get_rows_signature(pattern), limit=1)
+        col_differences = get_split_differences(get_columns_signature(pattern), limit=1)
 
-        best_index_row, max_reflected_row = find_reflection(row_signature)
-        best_index_col, max_reflected_col = find_reflection(col_signature)
+        for smudges in (0, 1):
+            summary = 100 * sum(find_reflections(row_differences, smudges))
+            summary += sum(find_reflections(col_differences, smudges))
+            if smudges == 0:
+                part_1 += summary
+            else:
+                part_2 += summary
 
-        print_pattern(pattern)
-        print(f"Row signature: {row_signature}")
-        print(f"Col signature: {col_signature}")
-
-        print(find_reflection(row_signature))
-        print(find_reflection(col_signature))
-
-        if max_reflected_row > max_reflected_col:
-            print(f"Mirror at: {best_index_row} row")
-            best_indexes.append(best_index_row * 100)
-        else:
-            print(f"Mirror at: {best_index_col} col")
-            best_indexes.append(best_index_col)
-
-        # print(f"Mirror at: {best_index_row} row")
-        # best_indexes.append(best_index_row * 100)
-        #
-        # print(f"Mirror at: {best_index_col} col")
-        # best_indexes.append(best_index_col)
-
-    print(best_indexes)
-    part_1 = sum(best_indexes)
-    return part_1, 0
+    return part_1, part_2
 
 
 TEST_INPUT_1 = """\
@@ -168,11 +162,31 @@ TEST_INPUT_2 = """\
 
 @pytest.mark.parametrize(
     ("input_s", "expected"),
-    ((TEST_INPUT_1, (405, 0)),),
+    ((TEST_INPUT_1, (405, 400)),),
 )
 def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+@pytest.mark.parametrize(
+    ("input_s", "smudges", "expected_rows", "expected_cols"),
+    (
+        (TEST_INPUT_2, 0, [4], []),
+        (TEST_INPUT_2, 1, [1], []),
+        (TEST_INPUT_1.split("\n\n")[0], 0, [], [5]),
+        (TEST_INPUT_1.split("\n\n")[0], 1, [3], []),
+    ),
+)
+def test_find_reflections(
+    input_s: str, smudges: int, expected_rows: list[int], expected_cols: list[int]
+) -> None:
+    [pattern] = parse_input(input_s)
+    rows = get_split_differences(get_rows_signature(pattern), limit=smudges)
+    cols = get_split_differences(get_columns_signature(pattern), limit=smudges)
+
+    assert find_reflections(rows, smudges) == expected_rows
+    assert find_reflections(cols, smudges) == expected_cols
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
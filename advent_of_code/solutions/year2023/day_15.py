@@ -1,9 +1,7 @@
-import re
-from collections import OrderedDict
-from typing import cast
-from typing import Literal
-from typing import NamedTuple
+from array import array
+from typing import Iterable
 
+import numpy as np
 import pytest
 
 from advent_of_code.core import aoc
@@ -15,74 +13,131 @@ YEAR = 2023
 DAY = 15
 
 
-Operation = Literal["=", "-"]
+# HASH state after adding one byte, indexed by `state << 8 | byte`
+HASH_TABLE = bytes(((h + b) * 17) % 256 for h in range(256) for b in range(256))
 
-
-class Step(NamedTuple):
-    label: str
-    operation: Operation
-    focal_length: int | None
+# Insertion order of a lens that is not in its box (anymore)
+REMOVED = -1
 
 
 def parse_input(s: str) -> list[str]:
     return s.strip().split(",")
 
 
-def parse_steps(steps: list[str]) -> list[Step]:
-    result = []
-    for step in steps:
-        match = re.match(
-            r"^(?P<label>[a-z]+)(?P<op>[=|-])(?P<focal_length>\d*)$", step
-        ).groupdict()  # type: ignore
-        result.append(
-            Step(
-                match["label"],
-                cast(Operation, match["op"]),
-                int(match["focal_length"]) if match["focal_length"] else None,
-            )
-        )
+def get_hash(value: str) -> int:
+    result = 0
+    for byte in value.encode():
+        result = HASH_TABLE[result << 8 | byte]
 
     return result
 
 
-def get_hash(value: str) -> int:
-    result = 0
-    for char in value:
-        result += ord(char)  # ASCII value
-        result *= 17
-        _, rem = divmod(result, 256)
-        result = rem
+def get_hashes(data: bytes, separator: bytes = b",") -> np.ndarray:
+    """
+    Computes the HASH of every step in `data` at once.
+
+    HASH is linear modulo 256: a byte followed by `k - 1` more bytes ends up
+    multiplied by `17 ** k`, and `17 ** k == 1 + 16 * k` (mod 256). Each step hash
+    is then a weighted sum of its bytes, and `uint8` arithmetic already wraps
+    around at 256. Empty steps, as after a trailing separator, hash to 0.
+    """
+    values = np.frombuffer(data, dtype=np.uint8)
+    if len(values) == 0:
+        return np.zeros(1, dtype=np.uint8)
+
+    is_separator = values == ord(separator)
+    # Index of each step, and the position right after the step of each byte
+    step = np.cumsum(is_separator) - is_separator
+    step_ends = np.append(np.flatnonzero(is_separator), len(values))
+    distances = (step_ends[step] - np.arange(len(values))).astype(np.uint8)
+
+    weights = 1 + 16 * distances
+    products = values * weights
+    products[is_separator] = 0
+    step_starts = np.append(0, step_ends[:-1] + 1)
+
+    # A step starting past the last byte is empty, `reduceat` cannot index it
+    non_empty = step_starts < len(values)
+    result = np.zeros(len(step_starts), dtype=np.uint8)
+    result[non_empty] = np.add.reduceat(
+        products, step_starts[non_empty], dtype=np.uint8
+    )
 
     return result
 
 
+class LensBoxes:
+    """
+    Lenses of all boxes, stored by label in flat arrays.
+
+    Instead of keeping the lenses of each box in order, every lens keeps the order
+    in which it was inserted. Removing a lens only marks its order as `REMOVED`,
+    and the slots of each box are worked out once, when the focusing power is
+    needed.
+    """
+
+    def __init__(self) -> None:
+        self._label_ids: dict[str, int] = {}
+        self._boxes = array("B")
+        self._focal_lengths = array("q")
+        self._orders = array("q")
+        self._total_inserted = 0
+
+    def _get_label_id(self, label: str) -> int:
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = self._label_ids[label] = len(self._boxes)
+            self._boxes.append(get_hash(label))
+            self._focal_lengths.append(0)
+            self._orders.append(REMOVED)
+        return label_id
+
+    def insert(self, label: str, focal_length: int) -> None:
+        """Replaces the lens with `label` in its box, or adds it at the end"""
+        label_id = self._get_label_id(label)
+        if self._orders[label_id] == REMOVED:
+            self._orders[label_id] = self._total_inserted
+            self._total_inserted += 1
+        self._focal_lengths[label_id] = focal_length
+
+    def remove(self, label: str) -> None:
+        label_id = self._label_ids.get(label)
+        if label_id is not None:
+            self._orders[label_id] = REMOVED
+
+    def apply(self, steps: Iterable[str]) -> None:
+        """Runs a whole initialization sequence of `label-` and `label=n` steps"""
+        for step in steps:
+            if step[-1] == "-":
+                self.remove(step[:-1])
+                continue
+
+            label, op, focal_length = step.partition("=")
+            if not op:
+                raise ValueError(f"Unexpected step: '{step}'")
+            self.insert(label, int(focal_length))
+
+    def get_focusing_power(self) -> int:
+        orders = np.frombuffer(self._orders, dtype=np.int64)
+        in_box = orders != REMOVED
+        boxes = np.frombuffer(self._boxes, dtype=np.uint8)[in_box].astype(np.int64)
+        focal_lengths = np.frombuffer(self._focal_lengths, dtype=np.int64)[in_box]
+
+        by_box = np.lexsort((orders[in_box], boxes))
+        boxes = boxes[by_box]
+        # Slot of each lens, counting from the first lens of the same box
+        slots = np.arange(len(boxes)) - np.searchsorted(boxes, boxes)
+
+        return int(((boxes + 1) * (slots + 1) * focal_lengths[by_box]).sum())
+
+
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    steps_1 = parse_input(s)
-    part_1 = sum(get_hash(step) for step in steps_1)
-
-    steps_2 = parse_steps(steps_1)
-    label_to_box = {step.label: get_hash(step.label) for step in steps_2}
-    boxes: list[dict[str, int]] = [OrderedDict() for _ in range(256)]  # 256 boxes* 256
-
-    for label, op, focal_length in steps_2:
-        box = label_to_box[label]
-        if op == "-":
-            if label in boxes[box]:
-                boxes[box].pop(label)
-        elif op == "=":
-            assert focal_length is not None
-            if label in boxes[box]:
-                boxes[box][label] = focal_length
-            else:
-                boxes[box][label] = focal_length
-        else:
-            raise ValueError(f"Unexpected op: '{op}'")
-
-    part_2 = sum(
-        sum((idx + 1) * value * (pos + 1) for pos, value in enumerate(box.values()))
-        for idx, box in enumerate(boxes)
-    )
+    part_1 = int(get_hashes(s.strip().encode()).sum(dtype=np.int64))
+
+    boxes = LensBoxes()
+    boxes.apply(parse_input(s))
+    part_2 = boxes.get_focusing_power()
 
     return part_1, part_2
 
@@ -100,5 +155,45 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+def test_lens_boxes() -> None:
+    boxes = LensBoxes()
+    boxes.insert("rn", 1)
+    boxes.insert("cm", 2)
+    boxes.remove("rn")
+    boxes.insert("rn", 3)
+    boxes.insert("cm", 4)
+    boxes.remove("qp")
+
+    # Both labels hash to box 0: "cm" keeps its slot, "rn" goes after it
+    assert boxes.get_focusing_power() == 1 * 1 * 4 + 1 * 2 * 3
+
+    boxes.apply(["cm-", "rn=5"])
+
+    assert boxes.get_focusing_power() == 1 * 1 * 5
+
+
+def test_get_hashes() -> None:
+    steps = parse_input(TEST_INPUT)
+
+    assert get_hash("HASH") == 52
+    assert list(get_hashes(b"HASH")) == [52]
+    assert list(get_hashes(TEST_INPUT.strip().encode())) == [
+        get_hash(step) for step in steps
+    ]
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    (
+        (b"", [0]),
+        (b"rn=1,", [get_hash("rn=1"), 0]),
+        (b"rn=1,,cm-", [get_hash("rn=1"), 0, get_hash("cm-")]),
+    ),
+)
+def test_get_hashes_empty_steps(data: bytes, expected: list[int]) -> None:
+    assert list(get_hashes(data)) == expected
+    assert [get_hash(step) for step in data.decode().split(",")] == expected
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
@@ -1,12 +1,9 @@
-from typing import Iterable
-from typing import TypeAlias
+from typing import Iterator
 
 import pytest
 
-from advent_of_code.algorithms.astar import a_star_search
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
-from advent_of_code.grids import Coord2D
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -14,116 +11,102 @@ YEAR = 2023
 DAY = 17
 
 
-State: TypeAlias = tuple[Coord2D, str]
+# Axis of the last run of moves: after a run, the crucible has to turn
+HORIZONTAL = 0
+VERTICAL = 1
 
 
-class LavaPoolAStarSearch:
-    _DIRECTIONS = {
-        "<": (-1, 0),  # left
-        ">": (1, 0),  # right
-        "^": (0, -1),  # up
-        "v": (0, 1),  # down
-    }
+class CityMap:
+    """Heat loss of each city block, stored row by row in a flat list.
 
-    _OPPOSITES = {
-        ">": "<",
-        "^": "v",
-        "<": ">",
-        "v": "^",
-    }
+    Search states are packed as `(row * width + col) * 2 + axis`, where `axis` is
+    the axis of the run that ended at the block.
+    """
 
     def __init__(self, values: list[list[int]]) -> None:
-        self._values = values
         self._width = len(values[0])
         self._height = len(values)
-
-    def get_adjacent_1(self, state: State) -> Iterable[tuple[State, int]]:
-        coord, dirs = state
-
-        for dir_, offset in self._DIRECTIONS.items():
-            new_cord = coord + offset
-            if 0 <= new_cord.x < self._width and 0 <= new_cord.y < self._height:
-                if self._OPPOSITES[dir_] in dirs:
-                    continue
-                cost_to_node = self._values[new_cord.y][new_cord.x]
-                if dir_ in dirs:
-                    # Can only move in same direction until 3 consecutive
-                    if len(dirs) < 3:
-                        yield (new_cord, dirs + dir_), cost_to_node
-                else:
-                    # Just ignore old direction memory _e.g._ ">>" -> "v"
-                    yield (new_cord, dir_), cost_to_node
-
-    def get_adjacent_2(self, state: State) -> Iterable[tuple[State, int]]:
-        coord, dirs = state
-
-        for dir_, offset in self._DIRECTIONS.items():
-            new_cord = coord + offset
-            if 0 <= new_cord.x < self._width and 0 <= new_cord.y < self._height:
-                cost_to_node = self._values[new_cord.y][new_cord.x]
-                opp = self._OPPOSITES[dir_]
-                if opp in dirs:
-                    continue
-
-                if dir_ in dirs or len(dirs) == 0:
-                    if len(dirs) < 10:
-                        yield (new_cord, dirs + dir_), cost_to_node
-                else:
-                    if len(dirs) >= 4:  # Only turn if it's current path is 4 or more
-                        yield (new_cord, dir_), cost_to_node
-
-    def heuristic(self, state_1: State, state_2: State) -> int:
-        # Manhattan distance should be fine
-        return abs(state_1[0].x - (self._width - 1)) + abs(
-            state_1[0].y - (self._height - 1)
-        )
+        self._heat = [v for row in values for v in row]
 
     @property
-    def start(self) -> Coord2D:
-        return Coord2D(x=0, y=0)
-
-    def goal_1(self, state: State) -> bool:
-        coord, _ = state
-        return coord.x == (self._width - 1) and coord.y == (self._height - 1)
+    def width(self) -> int:
+        return self._width
 
-    def goal_2(self, state: State) -> bool:
-        coord, dirs = state
-        return (
-            coord.x == (self._width - 1)
-            and coord.y == (self._height - 1)
-            and len(dirs) >= 4
-        )
+    @property
+    def height(self) -> int:
+        return self._height
+
+    def _iter_turns(
+        self, pos: int, axis: int, cost: int, min_run: int, max_run: int
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Yields the `(state, heat loss)` after every valid run from a block, turning
+        away from `axis` in both directions.
+        """
+        width, heat = self._width, self._heat
+        row, col = divmod(pos, width)
+        if axis == VERTICAL:
+            new_axis = HORIZONTAL
+            runs = ((1, width - 1 - col), (-1, col))
+        else:
+            new_axis = VERTICAL
+            runs = ((width, self._height - 1 - row), (-width, row))
+
+        for step, room in runs:
+            p, loss = pos, cost
+            for run in range(1, min(max_run, room) + 1):
+                p += step
+                loss += heat[p]
+                if run >= min_run:
+                    yield p * 2 + new_axis, loss
+
+    def find_min_heat_loss(self, min_run: int, max_run: int) -> int:
+        """Finds the least heat loss from the top left to the bottom right block.
+
+        Every run of `min_run` to `max_run` blocks along an axis is relaxed at once
+        from the block where the crucible turns, so states only need the block and
+        the axis. Costs are small integers, so a bucket queue replaces the heap.
+        """
+        target = self._width * self._height - 1
+        unreached = 10 * len(self._heat) * max_run
+        best = [unreached] * (2 * len(self._heat))
+        best[HORIZONTAL] = best[VERTICAL] = 0
+        buckets: list[list[int]] = [[HORIZONTAL, VERTICAL]]
+
+        cost = 0
+        while cost < len(buckets):
+            for state in buckets[cost]:
+                if best[state] < cost:
+                    continue  # Already reached with a lower cost
+                pos, axis = state >> 1, state & 1
+                if pos == target:
+                    return cost
+
+                for new_state, loss in self._iter_turns(
+                    pos, axis, cost, min_run, max_run
+                ):
+                    if loss < best[new_state]:
+                        best[new_state] = loss
+                        while len(buckets) <= loss:
+                            buckets.append([])
+                        buckets[loss].append(new_state)
+            cost += 1
+
+        raise ValueError(f"No path with runs of {min_run} to {max_run} blocks")
 
     @staticmethod
-    def from_str(s: str) -> "LavaPoolAStarSearch":
-        values: list[list[int]] = []
-
-        for row in s.splitlines():
-            curr_row = [int(c) for c in row]
-            values.append(curr_row)
-
-        return LavaPoolAStarSearch(values=values)
+    def from_str(s: str) -> "CityMap":
+        return CityMap(values=[[int(c) for c in row] for row in s.splitlines()])
 
 
 @aoc.solution(year=YEAR, day=DAY)
 def solve(s: str) -> Solution:
-    lava_pool = LavaPoolAStarSearch.from_str(s)
-
-    path_1 = a_star_search(
-        start=(lava_pool.start, ""),
-        goal=lava_pool.goal_1,
-        heuristic=lava_pool.heuristic,
-        get_adjacent=lava_pool.get_adjacent_1,
-    )
+    city = CityMap.from_str(s)
 
-    path_2 = a_star_search(
-        start=(lava_pool.start, ""),
-        goal=lava_pool.goal_2,
-        heuristic=lava_pool.heuristic,
-        get_adjacent=lava_pool.get_adjacent_2,
-    )
+    part_1 = city.find_min_heat_loss(min_run=1, max_run=3)
+    part_2 = city.find_min_heat_loss(min_run=4, max_run=10)
 
-    return path_1[-1][1], path_2[-1][1]
+    return part_1, part_2
 
 
 TEST_INPUT_1 = """\
@@ -162,5 +145,25 @@ def test_solve(input_s: str, expected: tuple[()]) -> None:
     assert solve(input_s).as_tuple() == expected
 
 
+@pytest.mark.parametrize(
+    ("input_s", "min_run", "max_run", "expected"),
+    (
+        ("1", 1, 3, 0),
+        ("19\n11", 1, 1, 2),
+        ("11111\n99991", 1, 3, 13),
+        ("11111\n99991", 5, 5, None),
+    ),
+)
+def test_find_min_heat_loss(
+    input_s: str, min_run: int, max_run: int, expected: int | None
+) -> None:
+    city = CityMap.from_str(input_s)
+    if expected is None:
+        with pytest.raises(ValueError, match="No path"):
+            city.find_min_heat_loss(min_run=min_run, max_run=max_run)
+    else:
+        assert city.find_min_heat_loss(min_run=min_run, max_run=max_run) == expected
+
+
 if __name__ == "__main__":
     print_solution(solve(get_input_data(YEAR, DAY)))
@@ -57,8 +57,6 @@ def solve(s: str) -> Solution:
             if i % j == 0:
                 factors[i].add(j)
 
-    print(factors)
-
     part_2 = sum(brute_force_part_2(lower, upper, factors) for lower, upper in range_values)
 
     return part_1, part_2
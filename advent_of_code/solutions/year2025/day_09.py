@@ -4,6 +4,7 @@ import pytest
 
 from advent_of_code.core import aoc
 from advent_of_code.core import print_solution
+from advent_of_code.polygons import Polygon
 from advent_of_code.type_defs import Solution
 from advent_of_code.utilities import get_input_data
 
@@ -29,47 +30,6 @@ def get_area(p1: Point, p2: Point) -> int:
     return (1 + abs(x1 - x2)) * (1 + abs(y1 - y2))
 
 
-def is_point_in_line(point: Point, segment: Segment) -> bool:
-    x, y = point
-    (x1, y1), (x2, y2) = segment
-    # all segments are either horizontal or vertical
-    if x1 == x2 and x == x1:  # line is horizontal
-        return min(y1, y2) <= y <= max(y1, y2)
-    else:  # line is vertical
-        return y == y1 and min(x1, x2) <= x <= max(x1, x2)
-
-
-def is_in_perimeter(p: Point, segments: list[Segment]) -> bool:
-    for segment in segments:
-        if is_point_in_line(p, segment):
-            return True
-    return False
-
-
-def is_point_in_polygon(p: Point, segments: list[Segment]) -> bool:
-    count = 0
-    x, y = p
-    for segment in segments:
-        (x1, y1), (x2, y2) = segment
-        # ignore vertical segments
-        if y1 == y2:
-            continue
-
-        if x1 < x:
-            continue
-
-        if y == y1 or y == y2:
-            # count only if line is going downwards from ray
-            if y == y1 and y2 < y1 or y == y2 and y1 < y2:
-                count += 1
-        else:
-            if min(y1, y2) < y < max(y1, y2):
-                count += 1
-
-
-    return count % 2 == 1
-
-
 def is_box_intersected(p1: Point, p2: Point, segments: list[Segment]) -> bool:
     (p1_x, p1_y), (p2_x, p2_y) = p1, p2
 
@@ -111,6 +71,7 @@ def part_2(coords: list[tuple[int, int]]) -> Result:
     max_area = float("-inf")
     pr_1, pr_2 = None, None
     segments = list(pairwise([coords[-1], *coords]))
+    polygon = Polygon(coords)
     for i in range(len(coords) - 1):
         for j in range(i + 1, len(coords)):
             p1 = coords[i]
@@ -126,7 +87,7 @@ def part_2(coords: list[tuple[int, int]]) -> Result:
             if is_box_intersected(p1, p2, segments):
                 continue
 
-            if (is_point_in_polygon(p3, segments) or is_in_perimeter(p3, segments)) and (is_point_in_polygon(p4, segments) or is_in_perimeter(p4, segments)):
+            if polygon.contains(p3) and polygon.contains(p4):
                 if curr_area > max_area:
                     pr_1, pr_2 = p1, p2
                 max_area = max(max_area, curr_area)
@@ -0,0 +1,100 @@
+from array import array
+from enum import IntEnum
+from typing import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+
+class OpCode(IntEnum):
+    NOOP = 0
+    ADDX = 1
+
+
+OPCODE_CYCLES: dict[OpCode, int] = {
+    OpCode.NOOP: 1,
+    OpCode.ADDX: 2,
+}
+
+MNEMONICS: dict[str, OpCode] = {
+    "noop": OpCode.NOOP,
+    "addx": OpCode.ADDX,
+}
+
+
+class Program(NamedTuple):
+    """A program compiled into flat arrays, one entry per instruction"""
+
+    opcodes: array
+    operands: array
+
+    @property
+    def cycles(self) -> int:
+        """Number of cycles needed to run the program once"""
+        return sum(OPCODE_CYCLES[OpCode(op)] for op in self.opcodes)
+
+
+def compile_program(lines: Iterable[str]) -> Program:
+    opcodes = array("B")
+    operands = array("q")
+
+    for line in lines:
+        mnemonic, *args = line.split()
+        if mnemonic not in MNEMONICS:
+            raise ValueError(f"Unknown instruction: {line}")
+        opcode = MNEMONICS[mnemonic]
+        opcodes.append(opcode)
+        operands.append(int(args[0]) if args else 0)
+
+    return Program(opcodes=opcodes, operands=operands)
+
+
+class VM:
+    """Runs a compiled program with a single `X` register.
+
+    Like the device of AoC 2022 day 10, the program starts over once it reaches
+    its end, keeping the value of `X`.
+    """
+
+    def __init__(self, program: Program, x: int = 1) -> None:
+        if not program.opcodes:
+            raise ValueError("Cannot run an empty program")
+        self._program = program
+        self._x = x
+
+    def trace(self, total_cycles: int) -> array:
+        """Returns the value of `X` during each of the first `total_cycles` cycles,
+        where `result[i]` is the value during cycle `i + 1`.
+
+        Every call runs the program from its start, with the starting value of `X`.
+        The program is only interpreted once. Every other pass produces the same
+        trace shifted by the change of `X` over a pass.
+        """
+        start = self._x
+        one_pass = array("q")
+        append = one_pass.append
+        x = start
+        addx, noop = OpCode.ADDX, OpCode.NOOP
+
+        for op, arg in zip(self._program.opcodes, self._program.operands, strict=True):
+            if op == addx:
+                append(x)
+                append(x)
+                x += arg
+            elif op == noop:
+                append(x)
+            else:
+                raise ValueError(f"Unknown opcode: {op}")
+
+        pass_cycles = len(one_pass)
+        delta = x - start
+
+        # Every pass at once: the first one, shifted by `delta` per pass so far
+        passes = -(-total_cycles // pass_cycles)
+        shifts = np.arange(passes, dtype=np.int64) * delta
+        values = np.frombuffer(one_pass, dtype=np.int64) + shifts[:, np.newaxis]
+
+        result = array("q")
+        result.frombytes(values.ravel()[:total_cycles].tobytes())
+
+        return result
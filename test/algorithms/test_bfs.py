@@ -0,0 +1,14 @@
+from typing import Iterable
+
+from advent_of_code.algorithms.bfs import get_distances_to
+
+
+def test_get_distances_to() -> None:
+    # One way edges: 0 -> 1 -> 2 -> 3, 4 -> 3, 3 -> 5
+    edges = {0: [1], 1: [2], 2: [3], 4: [3], 3: [5], 5: []}
+
+    def get_predecessors(node: int) -> Iterable[int]:
+        return [n for n, targets in edges.items() if node in targets]
+
+    assert get_distances_to(3, get_predecessors) == {3: 0, 2: 1, 4: 1, 1: 2, 0: 3}
+    assert get_distances_to(0, get_predecessors) == {0: 0}
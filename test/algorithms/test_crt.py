@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from advent_of_code.algorithms.crt import combine_congruences
+from advent_of_code.algorithms.crt import solve_congruences
+
+
+@pytest.mark.parametrize(
+    ("congruences", "expected"),
+    (
+        ([], (0, 1)),
+        ([(2, 3), (3, 5), (2, 7)], (23, 105)),
+        ([(3, 4), (1, 6)], (7, 12)),
+        ([(1, 4), (2, 6)], None),
+        ([(-1, 10), (19, 20)], (19, 20)),
+    ),
+)
+def test_solve_congruences(congruences, expected):
+    assert solve_congruences(congruences) == expected
+
+
+def test_solve_congruences_invalid_modulus():
+    with pytest.raises(ValueError, match="Invalid modulus"):
+        solve_congruences([(1, 0)])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_combine_congruences_matches_brute_force(seed):
+    rng = random.Random(seed)
+
+    for _ in range(50):
+        a = (rng.randint(0, 29), rng.randint(30, 60))
+        b = (rng.randint(0, 29), rng.randint(30, 60))
+        a, b = (a[0] % a[1], a[1]), (b[0] % b[1], b[1])
+        solutions = [
+            x for x in range(a[1] * b[1]) if x % a[1] == a[0] and x % b[1] == b[0]
+        ]
+
+        combined = combine_congruences(a, b)
+
+        if not solutions:
+            assert combined is None
+        else:
+            assert combined is not None
+            assert combined[0] == solutions[0]
+            assert all(x % combined[1] == combined[0] for x in solutions)
+            assert len(solutions) == a[1] * b[1] // combined[1]
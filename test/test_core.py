@@ -0,0 +1,114 @@
+import sys
+from functools import cache
+from types import ModuleType
+from typing import Iterator
+
+import pytest
+
+from advent_of_code.core import AdventOfCode
+from advent_of_code.core import StateGuard
+from advent_of_code.core import run_isolated
+from advent_of_code.exceptions import StateChangedError
+
+
+@pytest.fixture
+def app() -> AdventOfCode:
+    return AdventOfCode()
+
+
+@pytest.fixture
+def module() -> Iterator[ModuleType]:
+    module = ModuleType("fake_solution")
+    sys.modules[module.__name__] = module
+    yield module
+    del sys.modules[module.__name__]
+
+
+def add_solution(module: ModuleType, app: AdventOfCode, source: str) -> None:
+    # Solutions register with a local instance, instead of the global `aoc`
+    module.aoc = app
+    exec(source, vars(module))
+
+
+def test_state_guard(module):
+    module.TABLE = {"a": [1, 2]}
+    module.LIMIT = 10
+
+    def mutate() -> None:
+        with StateGuard(module):
+            module.TABLE["a"].append(3)
+            module.NEW = 2
+            del module.LIMIT
+
+    with pytest.raises(StateChangedError, match="LIMIT, NEW, TABLE"):
+        mutate()
+
+
+def test_state_guard_unchanged(module):
+    module.TABLE = {"a": [1, 2]}
+
+    with StateGuard(module) as guard:
+        module.TABLE["a"] = [1, 2]
+
+    assert guard.changed() == []
+
+
+def test_run_isolated(module, app):
+    add_solution(
+        module,
+        app,
+        """
+from functools import cache
+
+RANKS = {"a": 1}
+
+
+@cache
+def score(s):
+    return sum(RANKS.get(c, 0) for c in s)
+
+
+@aoc.solution(year=1, day=1)
+def solve(s):
+    if s == "mutate":
+        RANKS["a"] = 2
+    return score(s), 0
+""",
+    )
+
+    results = run_isolated(module.solve, "aba", repeat=3, app=app)
+
+    assert [r.as_tuple() for r in results] == [(2, 0)] * 3
+    # Cleared before every run, so the last one never hits the cache
+    assert module.score.cache_info().hits == 0
+
+    with pytest.raises(StateChangedError, match="RANKS"):
+        run_isolated(module.solve, "mutate", app=app)
+
+
+def test_run_isolated_clears_caches(module, app):
+    add_solution(
+        module,
+        app,
+        """
+@aoc.solution(year=1, day=1)
+def solve(s):
+    return 0, 0
+""",
+    )
+
+    @cache
+    def expensive(n: int) -> int:
+        return n * 2
+
+    app.register_cache(expensive)
+    expensive(2)
+
+    run_isolated(module.solve, "", repeat=2, app=app)
+
+    assert expensive.cache_info().currsize == 0
+
+
+def test_register_cache_invalid(app):
+    with pytest.raises(TypeError, match="not a functools cache"):
+        app.register_cache(print)
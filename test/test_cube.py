@@ -0,0 +1,100 @@
+import pytest
+
+from advent_of_code.cube import DOWN
+from advent_of_code.cube import LEFT
+from advent_of_code.cube import RIGHT
+from advent_of_code.cube import UP
+from advent_of_code.cube import CubeNet
+from advent_of_code.cube import compile_moves
+from advent_of_code.cube import get_flat_wrap_table
+from advent_of_code.cube import pack_state
+from advent_of_code.cube import unpack_state
+
+# The 11 cube nets, one character per face
+CUBE_NETS = (
+    ("X...", "XXXX", "X..."),
+    ("X...", "XXXX", ".X.."),
+    ("X...", "XXXX", "..X."),
+    ("X...", "XXXX", "...X"),
+    (".X..", "XXXX", ".X.."),
+    (".X..", "XXXX", "..X."),
+    ("XX..", ".XXX", ".X.."),
+    ("XX..", ".XXX", "..X."),
+    ("XX..", ".XXX", "...X"),
+    ("XX..", ".XX.", "..XX"),
+    ("XXX..", "..XXX"),
+)
+
+
+def make_board(net: tuple[str, ...], size: int) -> list[str]:
+    lines = []
+    for net_row in net:
+        row = "".join(("." if c == "X" else " ") * size for c in net_row).rstrip()
+        lines.extend([row] * size)
+    return lines
+
+
+@pytest.mark.parametrize("net", CUBE_NETS)
+@pytest.mark.parametrize("size", (1, 2, 5))
+def test_cube_net_wraps_are_reversible(net, size):
+    cube = CubeNet(make_board(net, size))
+    wraps = cube.get_wrap_table()
+
+    # Every face has 4 edges, and 5 of the 12 cube edges are joined in the net
+    assert len(wraps) == 14 * size
+
+    for (row, col, direction), (new_row, new_col, new_direction) in wraps.items():
+        back = cube.get_wrap(new_row, new_col, (new_direction + 2) % 4)
+        assert back == (row, col, (direction + 2) % 4)
+
+
+@pytest.mark.parametrize("net", CUBE_NETS)
+def test_cube_walk_around_returns_to_start(net):
+    size = 3
+    lines = make_board(net, size)
+    cube = CubeNet(lines)
+    moves = compile_moves(lines, cube.get_wrap_table())
+
+    for row, line in enumerate(lines):
+        for col, c in enumerate(line):
+            if c == " ":
+                continue
+            for direction in (RIGHT, DOWN, LEFT, UP):
+                start = pack_state(row, col, direction, width=cube.width)
+                state = start
+                for _ in range(4 * size):
+                    state = moves[state]
+                assert state == start
+
+
+def test_cube_net_example_wraps():
+    lines = make_board(("..X", "XXX", "..XX"), 4)
+    cube = CubeNet(lines)
+
+    # Wraps from the AoC 2022 day 22 example
+    assert cube.get_wrap(5, 11, RIGHT) == (8, 14, DOWN)
+    assert cube.get_wrap(11, 10, DOWN) == (7, 1, UP)
+    assert cube.get_wrap(4, 6, UP) == (2, 8, RIGHT)
+
+
+def test_cube_net_invalid():
+    with pytest.raises(ValueError, match="cannot be folded"):
+        CubeNet(["..", "."])
+
+    with pytest.raises(ValueError, match="does not fold"):
+        CubeNet(make_board(("XXXXXX",), 2))
+
+
+def test_flat_wrap_and_walls():
+    lines = ["  ...", "  .#.", "....."]
+    moves = compile_moves(lines, get_flat_wrap_table(lines))
+    width = 5
+
+    state = pack_state(0, 4, RIGHT, width=width)
+    assert unpack_state(moves[state], width=width) == (0, 2, RIGHT)
+
+    state = pack_state(2, 0, UP, width=width)
+    assert unpack_state(moves[state], width=width) == (2, 0, UP)
+
+    state = pack_state(0, 3, DOWN, width=width)
+    assert moves[state] == state
@@ -1,6 +1,7 @@
 import pytest
 
 from advent_of_code.grids import Coord2D
+from advent_of_code.grids import Grid3D
 
 
 def test_coord2d_init():
@@ -44,3 +45,39 @@ def test_coord2d__mul__(coord_1, coord_2, expected: Coord2D):
 )
 def test_coord2d__eq__(coord_1, coord_2, expected):
     assert (coord_1 == coord_2) == expected
+
+
+def test_grid3d_single_cube():
+    grid = Grid3D.from_points([(-5, 10, 3)])
+
+    assert (-5, 10, 3) in grid
+    assert (-5, 10, 4) not in grid
+    assert len(grid) == 1
+    assert grid.count_faces() == 6
+    grid.flood_fill_exterior()
+    assert grid.count_exterior_faces() == 6
+
+
+def test_grid3d_hollow_cube():
+    # 3x3x3 cube with a single air pocket in the middle
+    points = [
+        (x, y, z)
+        for x in range(3)
+        for y in range(3)
+        for z in range(3)
+        if (x, y, z) != (1, 1, 1)
+    ]
+    grid = Grid3D.from_points(points)
+
+    assert grid.count_faces() == 6 * 9 + 6
+    # The padded box is 7x7x7, minus the cube and the border layer
+    assert grid.flood_fill_exterior() == 5**3 - 3**3
+    assert grid.count_exterior_faces() == 6 * 9
+
+
+def test_grid3d_index_out_of_bounds():
+    grid = Grid3D(size_x=2, size_y=2, size_z=2)
+
+    with pytest.raises(IndexError):
+        grid.add(2, 0, 0)
+    assert (0, 0, -1) not in grid
@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from advent_of_code.intervals import IntervalMap
+from advent_of_code.intervals import IntervalSet
+from advent_of_code.intervals import contains
+from advent_of_code.intervals import overlaps
+
+
+def random_intervals(rng: random.Random, count: int) -> list[tuple[int, int]]:
+    result = []
+    for _ in range(count):
+        start = rng.randint(-50, 50)
+        result.append((start, start + rng.randint(0, 10)))
+    return result
+
+
+def to_set(intervals: IntervalSet) -> set[int]:
+    return {p for start, end in intervals for p in range(start, end + 1)}
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "expected_contains", "expected_overlaps"),
+    (
+        ((2, 8), (3, 7), True, True),
+        ((3, 7), (2, 8), False, True),
+        ((2, 4), (4, 6), False, True),
+        ((2, 3), (4, 5), False, False),
+        ((6, 6), (6, 6), True, True),
+    ),
+)
+def test_contains_and_overlaps(a, b, expected_contains, expected_overlaps):
+    assert contains(a, b) == expected_contains
+    assert overlaps(a, b) == expected_overlaps
+
+
+def test_interval_set_merges():
+    intervals = IntervalSet([(10, 14), (3, 5), (16, 20), (12, 18), (6, 6)])
+
+    assert list(intervals) == [(3, 6), (10, 20)]
+    assert len(intervals) == 2
+    assert intervals.size == 15
+    assert (intervals.min(), intervals.max()) == (3, 20)
+    assert 6 in intervals
+    assert 7 not in intervals
+    assert intervals.members([32, 17, 1, 5, 8, 11]) == [5, 11, 17]
+
+
+def test_interval_set_invalid():
+    with pytest.raises(ValueError, match="Invalid interval"):
+        IntervalSet([(3, 1)])
+
+    with pytest.raises(ValueError, match="no minimum"):
+        IntervalSet().min()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_interval_set_operations(seed):
+    rng = random.Random(seed)
+    a = IntervalSet(random_intervals(rng, rng.randint(0, 8)))
+    b = IntervalSet(random_intervals(rng, rng.randint(0, 8)))
+    set_a, set_b = to_set(a), to_set(b)
+
+    assert to_set(a | b) == set_a | set_b
+    assert to_set(a & b) == set_a & set_b
+    assert to_set(a - b) == set_a - set_b
+    assert a | b == IntervalSet([*a, *b])
+    assert a.size == len(set_a)
+    assert a.members(range(-60, 70)) == sorted(set_a)
+
+
+def test_interval_map():
+    mapping = IntervalMap([(98, 99, -48), (50, 97, 2)])
+
+    assert [mapping[p] for p in (0, 49, 50, 97, 98, 99, 100)] == [
+        0,
+        49,
+        52,
+        99,
+        50,
+        51,
+        100,
+    ]
+    assert list(mapping.map_intervals(IntervalSet([(45, 100)]))) == [(45, 100)]
+    assert list(mapping.map_intervals(IntervalSet([(79, 92)]))) == [(81, 94)]
+
+    with pytest.raises(ValueError, match="Overlapping"):
+        IntervalMap([(0, 10, 1), (5, 6, 2)])
+
+
+def random_map(rng: random.Random) -> IntervalMap:
+    pieces = []
+    start = -60
+    for _ in range(rng.randint(0, 6)):
+        start += rng.randint(0, 10)
+        end = start + rng.randint(0, 10)
+        pieces.append((start, end, rng.randint(-30, 30)))
+        start = end + 1
+    return IntervalMap(pieces)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_interval_map_matches_points(seed):
+    rng = random.Random(seed)
+    mapping = random_map(rng)
+    intervals = IntervalSet(random_intervals(rng, rng.randint(0, 8)))
+
+    expected = {mapping[p] for p in to_set(intervals)}
+
+    assert to_set(mapping.map_intervals(intervals)) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_interval_map_compose(seed):
+    rng = random.Random(seed)
+    maps = [random_map(rng) for _ in range(4)]
+    composed = maps[0].compose(maps[1]).compose(maps[2]).compose(maps[3])
+
+    for point in range(-150, 150):
+        expected = point
+        for mapping in maps:
+            expected = mapping[expected]
+        assert composed[point] == expected
+
+    intervals = IntervalSet(random_intervals(rng, rng.randint(1, 8)))
+    expected = min(composed[p] for p in to_set(intervals))
+
+    assert composed.min_image(intervals) == expected
+    assert composed.map_intervals(intervals).min() == expected
+
+
+def test_interval_map_compose_drops_redundant_breaks():
+    # Swapping two blocks twice maps every point to itself
+    swap = IntervalMap([(0, 4, 5), (5, 9, -5)])
+
+    assert swap.compose(swap).breaks == []
+    assert swap.compose(swap).offsets == [0]
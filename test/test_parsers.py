@@ -1,6 +1,10 @@
+import random
 from typing import Generic
 from typing import TypeVar
 
+import pytest
+
+from advent_of_code.parsers import MultiPatternMatcher
 from advent_of_code.parsers import parse_lines
 
 
@@ -64,3 +68,44 @@ def test_value():
     x = [*v]
     assert len(x) == 2
     assert {**v} == {"value": "foo", "duration_ns": 10}
+
+
+def test_multi_pattern_matcher():
+    matcher = MultiPatternMatcher({"she": 1, "he": 2, "hers": 3, "abcd": 4, "bc": 5})
+
+    assert matcher.find_first_last("ushers") == ((1, 1), (2, 2))
+    assert matcher.find_first_last("xabcdx") == ((1, 4), (2, 5))
+    assert matcher.find_first_last("xyz") is None
+
+    with pytest.raises(ValueError, match="non empty"):
+        MultiPatternMatcher({"": 1})
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_multi_pattern_matcher_matches_scan(seed):
+    rng = random.Random(seed)
+    patterns = {
+        "".join(rng.choice("ab") for _ in range(rng.randint(1, 4))): i
+        for i in range(rng.randint(1, 6))
+    }
+    matcher = MultiPatternMatcher(patterns)
+
+    for _ in range(50):
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 20)))
+        starts = [
+            i for i in range(len(text)) if any(text.startswith(p, i) for p in patterns)
+        ]
+
+        result = matcher.find_first_last(text)
+
+        if not starts:
+            assert result is None
+        else:
+            (first, first_value), (last, last_value) = result
+            assert (first, last) == (starts[0], starts[-1])
+            assert text.startswith(
+                next(p for p, v in patterns.items() if v == first_value), first
+            )
+            assert text.startswith(
+                next(p for p, v in patterns.items() if v == last_value), last
+            )
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from advent_of_code.polygons import Polygon
+from advent_of_code.polygons import get_boundary_points
+from advent_of_code.polygons import get_double_area
+from advent_of_code.polygons import get_interior_points
+
+SQUARE = [(0, 0), (4, 0), (4, 4), (0, 4)]
+# A "U" shape, with a notch from the top
+U_SHAPE = [(0, 0), (2, 0), (2, 3), (4, 3), (4, 0), (6, 0), (6, 6), (0, 6)]
+TRIANGLE = [(0, 0), (6, 0), (0, 3)]
+
+
+@pytest.mark.parametrize(
+    ("vertices", "double_area", "boundary", "interior"),
+    (
+        (SQUARE, 32, 16, 9),
+        ([*SQUARE, SQUARE[0]], 32, 16, 9),
+        (list(reversed(SQUARE)), 32, 16, 9),
+        (U_SHAPE, 60, 30, 16),
+        (TRIANGLE, 18, 12, 4),
+    ),
+)
+def test_area_and_points(vertices, double_area, boundary, interior):
+    assert get_double_area(vertices) == double_area
+    assert get_boundary_points(vertices) == boundary
+    assert get_interior_points(vertices) == interior
+
+
+def test_invalid_polygon():
+    with pytest.raises(ValueError, match="at least 3"):
+        get_double_area([(0, 0), (1, 1)])
+
+
+@pytest.mark.parametrize("vertices", (SQUARE, U_SHAPE, TRIANGLE))
+def test_polygon_contains_matches_pick(vertices):
+    polygon = Polygon(vertices)
+
+    inside = [
+        (x, y) for x in range(-2, 9) for y in range(-2, 9) if polygon.contains((x, y))
+    ]
+
+    assert len(inside) == polygon.interior_points + polygon.boundary_points
+
+
+def test_polygon_contains():
+    polygon = Polygon(U_SHAPE)
+
+    assert polygon.contains((1, 1))
+    assert polygon.contains((3, 3))  # Bottom of the notch
+    assert polygon.contains((6, 6))  # Vertex
+    assert not polygon.contains((3, 2))  # Inside of the notch
+    assert not polygon.contains((7, 3))
+    assert not polygon.contains((3, -1))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_polygon_contains_random_staircase(seed):
+    # Rectilinear polygon: a staircase over the x axis
+    rng = random.Random(seed)
+    vertices = [(0, 0)]
+    x = 0
+    heights = []
+    for _ in range(rng.randint(1, 6)):
+        height = rng.randint(1, 6)
+        width = rng.randint(1, 4)
+        heights.extend([height] * width)
+        vertices.extend([(x, height), (x + width, height)])
+        x += width
+    vertices.append((x, 0))
+    vertices = [v for i, v in enumerate(vertices) if v != vertices[i - 1]]
+    polygon = Polygon(vertices)
+
+    for px in range(-1, x + 2):
+        for py in range(-1, 8):
+            # Points under the staircase, including the edges between steps
+            top = max(heights[max(px - 1, 0) : px + 1], default=0)
+            expected = 0 <= px <= x and 0 <= py <= top
+            assert polygon.contains((px, py)) == expected, (px, py)
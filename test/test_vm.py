@@ -0,0 +1,47 @@
+import pytest
+
+from advent_of_code.vm import VM
+from advent_of_code.vm import OpCode
+from advent_of_code.vm import compile_program
+
+PROGRAM = ["noop", "addx 3", "addx -5"]
+
+
+def test_compile_program():
+    program = compile_program(PROGRAM)
+
+    assert list(program.opcodes) == [OpCode.NOOP, OpCode.ADDX, OpCode.ADDX]
+    assert list(program.operands) == [0, 3, -5]
+    assert program.cycles == 5
+
+
+def test_compile_program_unknown_instruction():
+    with pytest.raises(ValueError, match="Unknown instruction"):
+        compile_program(["mulx 3"])
+
+
+@pytest.mark.parametrize(
+    ("total_cycles", "expected"),
+    (
+        (0, []),
+        (3, [1, 1, 1]),
+        (5, [1, 1, 1, 4, 4]),
+        # The program starts over keeping the value of X
+        (12, [1, 1, 1, 4, 4, -1, -1, -1, 2, 2, -3, -3]),
+    ),
+)
+def test_vm_trace(total_cycles, expected):
+    vm = VM(program=compile_program(PROGRAM))
+
+    assert vm.trace(total_cycles).tolist() == expected
+
+
+def test_vm_trace_starting_x():
+    vm = VM(program=compile_program(PROGRAM), x=10)
+
+    assert vm.trace(5).tolist() == [10, 10, 10, 13, 13]
+
+
+def test_vm_empty_program():
+    with pytest.raises(ValueError, match="empty program"):
+        VM(program=compile_program([]))